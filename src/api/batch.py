@@ -0,0 +1,47 @@
+# Import standard libraries
+from typing import Any, Callable, List, Union
+
+# Import project code
+from api.token_stream import TokenStream
+
+
+def is_batch(text: Any) -> bool:
+    """
+    Tells whether the input of a util function is a list of texts rather than a single text or token stream.
+
+    Parameters:
+    - text (Any): The input of a util function.
+
+    Returns:
+    - bool: True if the input is a list of texts.
+    """
+    return isinstance(text, list) and not isinstance(text, TokenStream)
+
+
+def map_unique(func: Callable[[str], Any], texts: List[str]) -> List[Any]:
+    """
+    Applies a function to a list of texts, calling it once per distinct text.
+
+    Parameters:
+    - func (Callable[[str], Any]): The function to apply to each text.
+    - texts (List[str]): The input texts.
+
+    Returns:
+    - List[Any]: The results, in the order of the input texts. Identical texts share the same result object.
+    """
+    results = {text: func(text) for text in dict.fromkeys(texts)}
+    return [results[text] for text in texts]
+
+
+def apply(func: Callable[[str], Any], text: Union[str, List[str]]) -> Any:
+    """
+    Applies a function to a single text, or to every distinct text of a list of texts.
+
+    Parameters:
+    - func (Callable[[str], Any]): The function to apply.
+    - text (Union[str, List[str]]): The input text or list of texts.
+
+    Returns:
+    - Any: The result for a single text, or the list of results for a list of texts.
+    """
+    return map_unique(func, text) if is_batch(text) else func(text)
@@ -4,34 +4,37 @@ from flask_restx import fields, Namespace
 flattener_ns = Namespace("flattener", description="This service contains methods designed to simplify or reduce the complexity of the text, such as removing line breaks, whitespace, or special characters.")
 
 handle_line_feeds_model = flattener_ns.model("HandleLineFeeds", {
-    "text": fields.String(required=True, description="The input text."),
+    "text": fields.Raw(required=True, description="The input text, or a list of input texts."),
     "mode": fields.String(required=False, description="The mode to handle line feeds, either 'remove',  'crlf' (carriage return) or 'lf' (line feed). Defaults to 'remove'." )
 })
 
 remove_brackets_model = flattener_ns.model("RemoveBrackets", {
-    "text": fields.String(required=True, description="The input text.")
+    "text": fields.Raw(required=True, description="The input text, or a list of input texts.")
 })
 
 remove_html_tags_model = flattener_ns.model("RemoveHtmlTags", {
-    "text": fields.String(required=True, description="The input text.")
+    "text": fields.Raw(required=True, description="The input text, or a list of input texts."),
+    "mode": fields.String(required=False, description="The parsing mode - either 'stream' or 'soup'. Defaults to 'stream'.")
 })
 
 remove_list_markers_model = flattener_ns.model("RemoveListMarkers", {
-    "text": fields.String(required=True, description="The input text.")
+    "text": fields.Raw(required=True, description="The input text, or a list of input texts.")
 })
 
 remove_special_characters_model = flattener_ns.model("RemoveSpecialCharacters", {
-    "text": fields.String(required=True, description="The input text."),
+    "text": fields.Raw(required=True, description="The input text, or a list of input texts."),
     "remove_unicode": fields.Boolean(required=False, description="If True, removes unicode characters. If False, does not remove unicode. Defaults to False.")
 })
 
 remove_stopwords_model = flattener_ns.model("RemoveStopwords", {
-    "text": fields.String(required=True, description="The input text."),
-    "stop_words": fields.List(fields.String, required=False, description="A custom list of stopwords to remove. If None, uses the default set of English stopwords from NLTK. Defaults to None.")
+    "text": fields.Raw(required=True, description="The input text, or a list of input texts."),
+    "stop_words": fields.List(fields.String, required=False, description="A custom list of stopwords to remove. If None, uses the NLTK stopwords of the given language. Defaults to None."),
+    "language": fields.String(required=False, description="The language of the NLTK stopwords, such as 'english', 'french' or 'german'. Defaults to 'english'."),
+    "tokenizer": fields.String(required=False, description="The word tokenizer - either 'treebank' for NLTK's word_tokenize, or 'regex' for a faster single-pattern tokenizer that agrees with it on common English text. Defaults to 'treebank'.")
 })
 
 remove_whitespace_model = flattener_ns.model("RemoveWhiteSpace", {
-    "text": fields.String(required=True, description="The input text."),
+    "text": fields.Raw(required=True, description="The input text, or a list of input texts."),
     "mode": fields.String(required=True, description="The mode to remove whitespaces, either 'leading', 'trailing', 'all' or 'strip'. Defaults to 'strip'."),
     "keep_duplicates": fields.Boolean(required=False, description="Whether to keep duplicate whitespaces. Defaults to False.")
 })
@@ -1,7 +1,7 @@
 # Import third-party libraries
 import inspect
 from flask_restx import Resource
-from typing import Dict, Any
+from typing import Any, Dict, List, Union
 
 # Import project code
 from . import flattener_utils
@@ -21,7 +21,7 @@ class HandleLineFeedsResource(Resource):
         """
         try:
             data: Dict[str, Any] = api.payload
-            text: str = data.get("text", "")
+            text: Union[str, List[str]] = data.get("text", "")
             mode: str = data.get("mode", "remove")
 
             if not text:
@@ -44,7 +44,7 @@ class RemoveBracketsResource(Resource):
         """
         try:
             data: Dict[str, Any] = api.payload
-            text: str = data.get("text", "")
+            text: Union[str, List[str]] = data.get("text", "")
             
             if not text:
                 return {"error": "No text provided."}, 400
@@ -66,12 +66,13 @@ class RemoveHtmlTagsResource(Resource):
         """
         try:
             data: Dict[str, Any] = api.payload
-            text: str = data.get("text", "")
+            text: Union[str, List[str]] = data.get("text", "")
+            mode: str = data.get("mode", "stream")
             
             if not text:
                 return {"error": "No text provided."}, 400
             
-            result = flattener_utils.remove_html_tags(text)
+            result = flattener_utils.remove_html_tags(text, mode)
             
             return {"result": result}, 200
         
@@ -89,7 +90,7 @@ class RemoveListMarkersResource(Resource):
         """
         try:
             data: Dict[str, Any] = api.payload
-            text: str = data.get("text", "")
+            text: Union[str, List[str]] = data.get("text", "")
             
             if not text:
                 return {"error": "No text provided."}, 400
@@ -111,7 +112,7 @@ class RemoveSpecialCharactersResource(Resource):
         """
         try:
             data: Dict[str, Any] = api.payload
-            text: str = data.get("text", "")
+            text: Union[str, List[str]] = data.get("text", "")
             remove_unicode: bool = data.get("remove_unicode", False)
             custom_characters: str = data.get("custom_characters", None)
 
@@ -135,13 +136,15 @@ class RemoveStopwordsResource(Resource):
         """
         try:
             data: Dict[str, Any] = api.payload
-            text: str = data.get("text", "")
+            text: Union[str, List[str]] = data.get("text", "")
             stop_words: list = data.get("stop_words", None)
+            language: str = data.get("language", "english")
+            tokenizer: str = data.get("tokenizer", "treebank")
 
             if not text:
                 return {"error": "No text provided."}, 400
             
-            result = flattener_utils.remove_stopwords(text, stop_words)            
+            result = flattener_utils.remove_stopwords(text, stop_words, language, tokenizer)            
             return {"result": result}, 200
         
         except Exception as e:
@@ -158,7 +161,7 @@ class RemoveWhiteSpaceResource(Resource):
         """
         try:
             data: Dict[str, Any] = api.payload
-            text: str = data.get("text", "")
+            text: Union[str, List[str]] = data.get("text", "")
             mode: str = data.get("mode", "strip")
             keep_duplicates: bool = data.get("keep_duplicates", False)
 
@@ -1,140 +1,297 @@
 # Import standard libraries
+import functools
 import re
-from typing import Optional
+from html.parser import HTMLParser
+from typing import FrozenSet, Iterable, List, Optional, Tuple, Union
 
 # Import third-party libraries
 from bs4 import BeautifulSoup
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize as _word_tokenize
 
+# Import project code
+from api import batch, token_stream
+from api.token_stream import TokenStream
 
-def handle_line_feeds(text: str, mode: str = 'remove') -> str:
+_BRACKET_TOKENS_RE = re.compile(r'[\[\](){}\n]')
+_BRACKET_PAIRS = {']': '[', ')': '(', '}': '{'}
+_CLOSING_TAG_RE = re.compile(r'</[^>]+>')
+_LIST_MARKERS_RE = re.compile(r'(^|\s)[0-9a-zA-Z][.)]\s+|(^|\s)[ivxIVX]+[.)]\s+')
+_SPECIAL_CHARACTERS_RE = re.compile(r'[^\w\s]')
+_LINE_FEED_TABLE = str.maketrans({'\n': ' ', '\r': None})
+_WHITESPACE_REMOVERS = {
+    'leading': str.lstrip,
+    'trailing': str.rstrip,
+    'all': lambda s: ''.join(s.split()),
+    'strip': str.strip,
+}
+
+# Number of characters handed to the streaming HTML parser at a time, which bounds its internal buffer.
+HTML_CHUNK_SIZE = 65536
+
+# Elements whose content is not text.
+_NON_TEXT_TAGS = frozenset(['script', 'style'])
+
+# Maximum number of distinct custom stopword lists kept as sets.
+STOPWORD_CACHE_SIZE = 256
+
+
+@functools.lru_cache(maxsize=256)
+def _deletion_table(characters: str) -> dict:
+    return str.maketrans('', '', characters)
+
+
+def handle_line_feeds(text: Union[str, List[str]], mode: str = 'remove') -> Union[str, List[str]]:
     """
     Handles line feeds in the text based on the selected mode.
 
     Parameters:
-    - text (str): The input text.
+    - text (Union[str, List[str]]): The input text, or a list of texts.
     - mode (str): The mode to handle line feeds - either 'remove', 'crlf', or 'lf'. Defaults to 'remove'.
 
     Returns:
-    - str: Text with line feeds handled as per the mode.
+    - Union[str, List[str]]: Text with line feeds handled as per the mode, or a list of such texts.
     """
     modes = ['remove', 'crlf', 'lf']
     if mode not in modes:
         raise ValueError(
             f"Invalid mode: '{mode}'. Valid options are {', '.join(modes)}.")
 
-    if mode == 'remove':
-        return text.replace('\n', ' ').replace('\r', '')
-    elif mode == 'crlf':
-        return text.replace('\n', '\r\n').replace('\r\r\n', '\r\n')
-    elif mode == 'lf':
-        return text.replace('\r\n', '\n').replace('\r', '\n')
+    def process(s: str) -> str:
+        if mode == 'remove':
+            # str.translate only beats two replace passes on its ASCII fast path.
+            return s.translate(_LINE_FEED_TABLE) if s.isascii() else s.replace('\n', ' ').replace('\r', '')
+        elif mode == 'crlf':
+            return s.replace('\n', '\r\n').replace('\r\r\n', '\r\n')
+        elif mode == 'lf':
+            return s.replace('\r\n', '\n').replace('\r', '\n')
+
+    return batch.apply(process, text)
 
 
-def remove_brackets(text: str) -> str:
+def _bracket_spans(text: str) -> List[Tuple[int, int]]:
+    """
+    Finds the outermost matched bracket pairs of each line in a single scan over the bracket characters. A closing
+    bracket matches the innermost open bracket of its kind, and any open brackets left unclosed inside it are dropped.
+    A closing bracket with no open bracket of its kind is left as text.
     """
-    Remove text inside brackets, braces, and parentheses.
+    spans = []
+    openers = []
+    # Number of open brackets of each kind, so a closing bracket with nothing to match is skipped without a search.
+    open_counts = dict.fromkeys(_BRACKET_PAIRS.values(), 0)
+
+    for match in _BRACKET_TOKENS_RE.finditer(text):
+        char = match.group()
+        if char == '\n':
+            openers.clear()
+            open_counts = dict.fromkeys(open_counts, 0)
+        elif char not in _BRACKET_PAIRS:
+            openers.append((char, match.start()))
+            open_counts[char] += 1
+        elif open_counts[_BRACKET_PAIRS[char]]:
+            # Each open bracket is popped at most once.
+            while True:
+                opener, start = openers.pop()
+                open_counts[opener] -= 1
+                if opener == _BRACKET_PAIRS[char]:
+                    break
+            # Each span is discarded at most once, when the pair enclosing it closes.
+            while spans and spans[-1][0] > start:
+                spans.pop()
+            spans.append((start, match.end()))
+
+    return spans
+
+
+def remove_brackets(text: Union[str, List[str]]) -> Union[str, List[str]]:
+    """
+    Remove text inside brackets, braces, and parentheses, including nested ones. Brackets are matched within a line.
+    A closing bracket matches the nearest opener of its kind, and openers of other kinds left unclosed inside it are
+    removed with its content, so "a (b [c) d" becomes "a  d". Brackets that never match are kept. The text is scanned
+    once, so this runs in linear time.
 
     Parameters:
-    - text (str): Input string.
+    - text (Union[str, List[str]]): Input string, or a list of strings.
 
     Returns:
-    - str: Text without content inside brackets, braces, and parentheses.
+    - Union[str, List[str]]: Text without content inside brackets, braces, and parentheses, or a list of such texts.
     """
-    return re.sub(r'\[.*?\]|\(.*?\)|\{.*?\}', '', text)
+    def process(s: str) -> str:
+        parts = []
+        previous_end = 0
+        for start, end in _bracket_spans(s):
+            parts.append(s[previous_end:start])
+            previous_end = end
+        parts.append(s[previous_end:])
+        return ''.join(parts)
+
+    return batch.apply(process, text)
 
 
-def remove_html_tags(text: str) -> str:
+class _HtmlTextExtractor(HTMLParser):
     """
-    Remove HTML tags from a text.
+    An event-based HTML parser that collects text as it is parsed, without building a document tree. Closing tags
+    become spaces, and the content of script and style elements is dropped.
+    """
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _NON_TEXT_TAGS:
+            self.skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in _NON_TEXT_TAGS and self.skip_depth:
+            self.skip_depth -= 1
+        self.parts.append(' ')
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.parts.append(data)
+
+
+def _strip_html_stream(text: str) -> str:
+    parser = _HtmlTextExtractor()
+    for start in range(0, len(text), HTML_CHUNK_SIZE):
+        parser.feed(text[start:start + HTML_CHUNK_SIZE])
+    parser.close()
+    return ''.join(parser.parts)
+
+
+def _strip_html_soup(text: str) -> str:
+    text = _CLOSING_TAG_RE.sub(' ', text)
+    soup = BeautifulSoup(text, "html.parser")
+    return soup.get_text()
+
+
+def remove_html_tags(text: Union[str, List[str]], mode: str = 'stream') -> Union[str, List[str]]:
+    """
+    Remove HTML tags from a text. In 'stream' mode the text is parsed incrementally and only the extracted text is
+    kept in memory, with the content of script and style elements dropped. In 'soup' mode a full BeautifulSoup tree
+    is built, as in earlier versions.
 
     Parameters:
-    - text (str): Input string
+    - text (Union[str, List[str]]): Input string, or a list of strings
+    - mode (str): The parsing mode - either 'stream' or 'soup'. Defaults to 'stream'.
 
     Returns:
-    - str: Text without HTML tags
+    - Union[str, List[str]]: Text without HTML tags, or a list of such texts
     """
-    text = re.sub(r'</[^>]+>', ' ', text)
-    soup = BeautifulSoup(text, "html.parser")
-    return soup.get_text()
+    modes = {'stream': _strip_html_stream, 'soup': _strip_html_soup}
+    if mode not in modes:
+        raise ValueError(
+            f"Invalid mode: '{mode}'. Valid options are {', '.join(modes)}.")
+
+    return batch.apply(modes[mode], text)
 
 
-def remove_list_markers(text: str) -> str:
+def remove_list_markers(text: Union[str, List[str]]) -> Union[str, List[str]]:
     """
-    This method removes list markers (numbering and bullets) from given text.
+    This method removes list markers (numbering and bullets) from given text. Markers are only matched after
+    whitespace or at the start of the text, so this runs in linear time.
 
     Parameters:
-    - text (str): The input text to remove list markers from.
+    - text (Union[str, List[str]]): The input text to remove list markers from, or a list of texts.
 
     Returns:
-    - str: The text with list markers removed.
+    - Union[str, List[str]]: The text with list markers removed, or a list of such texts.
     """
-    return re.sub(r'(^|\s)[0-9a-zA-Z][.)]\s+|(^|\s)[ivxIVX]+[.)]\s+', ' ', text)
+    def process(s: str) -> str:
+        return _LIST_MARKERS_RE.sub(' ', s)
+
+    return batch.apply(process, text)
 
 
-def remove_special_characters(text: str, remove_unicode: bool = False, custom_characters: Optional[str] = None) -> str:
+def remove_special_characters(text: Union[str, List[str]], remove_unicode: bool = False, custom_characters: Optional[str] = None) -> Union[str, List[str]]:
     """
     Removes special characters from the text.
 
     Parameters:
-    - text (str): The input text.
+    - text (Union[str, List[str]]): The input text, or a list of texts.
     - remove_unicode (bool): Whether to remove unicode characters. Defaults to False.
     - custom_characters (Optional[str]): Custom characters to be removed. Defaults to None.
 
     Returns:
-    - str: The text with special characters removed.
+    - Union[str, List[str]]: The text with special characters removed, or a list of such texts.
     """
-    processed_texts = []
+    table = _deletion_table(custom_characters) if custom_characters is not None else None
 
-    if remove_unicode:
-        processed_text = re.sub(r'[^\w\s]', '', text)
-        processed_text = ''.join(
-            char for char in processed_text if ord(char) < 128)
-    elif custom_characters is not None:
-        processed_text = text
-        for character in custom_characters:
-            processed_text = processed_text.replace(character, '')
-    else:
-        processed_text = re.sub(r'[^\w\s]', '', text)
+    def process(s: str) -> str:
+        if remove_unicode:
+            processed_text = _SPECIAL_CHARACTERS_RE.sub('', s)
+            return processed_text.encode('ascii', 'ignore').decode('ascii')
+        elif table is not None:
+            return s.translate(table)
+        else:
+            return _SPECIAL_CHARACTERS_RE.sub('', s)
 
-    processed_texts.append(processed_text)
-    return ' '.join(processed_texts)
+    return batch.apply(process, text)
 
 
-def remove_stopwords(text: str, stop_words: Optional[set] = None) -> str:
+@functools.lru_cache(maxsize=None)
+def _language_stopwords(language: str) -> FrozenSet[str]:
+    if language not in stopwords.fileids():
+        raise ValueError(
+            f"Unsupported language '{language}'. Supported languages are: {', '.join(stopwords.fileids())}")
+    return frozenset(stopwords.words(language))
+
+
+@functools.lru_cache(maxsize=STOPWORD_CACHE_SIZE)
+def _custom_stopwords(stop_words: tuple) -> FrozenSet[str]:
+    return frozenset(stop_words)
+
+
+try:
+    _language_stopwords('english')
+except LookupError:
+    # The stopwords corpus is not installed yet. Languages are loaded on first use instead.
+    pass
+
+
+def _stopword_set(stop_words: Optional[Iterable[str]], language: str) -> FrozenSet[str]:
+    if stop_words is None:
+        return _language_stopwords(language.lower())
+    if isinstance(stop_words, (set, frozenset)):
+        return stop_words
+    return _custom_stopwords(tuple(stop_words))
+
+
+def remove_stopwords(text: Union[str, List[str], TokenStream], stop_words: Optional[Iterable[str]] = None, language: str = 'english', tokenizer: str = 'treebank') -> Union[str, List[str], TokenStream]:
     """
-    This method removes stopwords from given text.
+    This method removes stopwords from given text. NLTK stopword lists are loaded once per language and custom lists
+    are cached by content, so neither is rebuilt per call. The stopword set is shared by a whole list of texts.
 
     Parameters:
-    - text (str): The input text to remove stopwords from.
-    - stop_words (Optional[set]): A set of stopwords to remove. If None, uses the default set of English stopwords from NLTK. Default is None.
+    - text (Union[str, List[str], TokenStream]): The input text to remove stopwords from, a list of texts, or an already tokenized token stream.
+    - stop_words (Optional[Iterable[str]]): A custom collection of stopwords to remove. If None, uses the NLTK stopwords of the given language. Default is None.
+    - language (str): The language of the NLTK stopwords, such as 'english', 'french' or 'german'. Ignored if stop_words is given. Default is 'english'.
+    - tokenizer (str): The word tokenizer used for text. Options are 'treebank' and 'regex'. Default is 'treebank'.
 
     Returns:
-    - str: The list of tokens with stopwords removed.
+    - Union[str, List[str], TokenStream]: The text with stopwords removed, a list of such texts, or a token stream if a token stream was given.
     """
-    if stop_words is None:
-        stop_words = set(stopwords.words('english'))
-    if isinstance(stop_words, list):
-        stop_words = set(stop_words)
+    stop_words = _stopword_set(stop_words, language)
 
-    tokens = _word_tokenize(text)
-    processed_tokens = [token for token in tokens if token not in stop_words]
+    def process(s: Union[str, TokenStream]) -> Union[str, TokenStream]:
+        tokens = token_stream.tokens_of(s, tokenizer)
+        processed_tokens = [token for token in tokens if token not in stop_words]
+        return token_stream.like_input(s, processed_tokens)
 
-    return ' '.join(processed_tokens)
+    return batch.apply(process, text)
 
 
-def remove_whitespace(text: str, mode: str = 'strip', keep_duplicates: bool = False) -> str:
+def remove_whitespace(text: Union[str, List[str]], mode: str = 'strip', keep_duplicates: bool = False) -> Union[str, List[str]]:
     """
-    Removes whitespace from the text based on the selected mode.
+    Removes whitespace from the text based on the selected mode. This runs in linear time, using no regular expressions.
 
     Parameters:
-    - text (str): The input text.
+    - text (Union[str, List[str]]): The input text, or a list of texts.
     - mode (str): The mode to remove whitespaces - either 'leading', 'trailing', 'all', or 'strip'. Defaults to 'strip'.
     - keep_duplicates (bool): Whether to keep duplicate whitespaces. Defaults to False.
 
     Returns:
-    - str: The text with whitespace removed as per the mode.
+    - Union[str, List[str]]: The text with whitespace removed as per the mode, or a list of such texts.
     """
     modes = ['leading', 'trailing', 'all', 'strip']
 
@@ -142,17 +299,19 @@ def remove_whitespace(text: str, mode: str = 'strip', keep_duplicates: bool = Fa
         raise ValueError(
             f"Invalid mode: '{mode}'. Valid options are {', '.join(modes)}.")
 
-    if mode == 'leading':
-        processed_text = re.sub(r'^\s+', '', text, flags=re.UNICODE)
-    elif mode == 'trailing':
-        processed_text = re.sub(r'\s+$', '', text, flags=re.UNICODE)
-    elif mode == 'all':
-        processed_text = re.sub(r'\s+', '', text, flags=re.UNICODE)
-    elif mode == 'strip':
-        processed_text = re.sub(r'^\s+|\s+$', '', text, flags=re.UNICODE)
+    remove = _WHITESPACE_REMOVERS[mode]
+
+    def process(s: str) -> str:
+        processed_text = remove(s)
+        if keep_duplicates or not processed_text:
+            return processed_text
 
-    if not keep_duplicates:
-        processed_text = ' '.join(
-            re.split('\s+', processed_text, flags=re.UNICODE))
+        # Runs of whitespace collapse to a single space, including at either end of the text.
+        words = processed_text.split()
+        if not words:
+            return ' '
+        leading = ' ' if processed_text[0].isspace() else ''
+        trailing = ' ' if processed_text[-1].isspace() else ''
+        return leading + ' '.join(words) + trailing
 
-    return processed_text
+    return batch.apply(process, text)
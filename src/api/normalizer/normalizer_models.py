@@ -4,28 +4,34 @@ from flask_restx import fields, Namespace
 normalizer_ns = Namespace("normalizer", description="This service provides utilities to standardize and normalize text, such as removing punctuation, handling unicode, or lemmatizing words.")
 
 expand_contractions_model = normalizer_ns.model("ExpandContractions", {
-    "text": fields.String(required=True, description="The input text.")
+    "text": fields.Raw(required=True, description="The input text, or a list of input texts."),
+    "extra_contractions": fields.Raw(required=False, description="Additional contractions mapped to their expansions.")
 })
 
 lemmatize_text_model = normalizer_ns.model("LemmatizeText", {
-    "text": fields.String(required=True, description="The input text.")
+    "text": fields.Raw(required=True, description="The input text, or a list of input texts."),
+    "tokenizer": fields.String(required=False, description="The word tokenizer - either 'treebank' for NLTK's word_tokenize, or 'regex' for a faster single-pattern tokenizer that agrees with it on common English text. Defaults to 'treebank'.")
 })
 
 normalize_unicode_model = normalizer_ns.model("NormalizeUnicode", {
-    "text": fields.String(required=True, description="The input text.")
+    "text": fields.Raw(required=True, description="The input text, or a list of input texts."),
+    "form": fields.String(required=False, description="The normalization form. Options are 'NFC', 'NFKC', 'NFD' and 'NFKD'. Defaults to 'NFKD'."),
+    "ascii_only": fields.Boolean(required=False, description="Whether to remove characters that are not ASCII after normalization. Defaults to True."),
+    "casefold": fields.Boolean(required=False, description="Whether to also casefold the text. Defaults to False.")
 })
 
 remove_numbers_model = normalizer_ns.model("RemoveNumbers", {
-    "text": fields.String(required=True, description="The input text.")
+    "text": fields.Raw(required=True, description="The input text, or a list of input texts.")
 })
 
 remove_punctuation_model = normalizer_ns.model("RemovePunctuation", {
-    "text": fields.String(required=True, description="The input text."),
+    "text": fields.Raw(required=True, description="The input text, or a list of input texts."),
     "punctuations": fields.String(required=False, description="The specific punctuations to remove. Defaults to None, which means all punctuations will be removed."),
     "remove_duplicates": fields.Boolean(required=False, description="If True, duplicate punctuations will be removed. Defaults to False.")
 })
 
 stem_words_model = normalizer_ns.model("StemWords", {
-    "text": fields.String(required=True, description="The input text."),
-    "stemmer": fields.String(required=False, description="The stemmer algorithm to use. Options are 'snowball', 'porter' and 'lancaster'. Defaults to 'porter'.")
+    "text": fields.Raw(required=True, description="The input text, or a list of input texts."),
+    "stemmer": fields.String(required=False, description="The stemmer algorithm to use. Options are 'snowball', 'porter' and 'lancaster'. Defaults to 'porter'."),
+    "tokenizer": fields.String(required=False, description="The word tokenizer - either 'treebank' for NLTK's word_tokenize, or 'regex' for a faster single-pattern tokenizer that agrees with it on common English text. Defaults to 'treebank'.")
 })
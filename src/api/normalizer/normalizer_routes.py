@@ -1,7 +1,7 @@
 # Import third-party libraries
 import inspect
 from flask_restx import Resource
-from typing import Dict, Any
+from typing import Any, Dict, List, Union
 
 # Import project code
 from . import normalizer_utils
@@ -21,12 +21,13 @@ class ExpandContractionsResource(Resource):
         """
         try:    
             data: Dict[str, Any] = api.payload
-            text: str = data.get("text", "")
+            text: Union[str, List[str]] = data.get("text", "")
+            extra_contractions: Dict[str, str] = data.get("extra_contractions", None)
             
             if not text:
                 return {"error": "No text provided."}, 400
             
-            result = normalizer_utils.expand_contractions(text)
+            result = normalizer_utils.expand_contractions(text, extra_contractions)
             return {"result": result}, 200
         
         except Exception as e:
@@ -43,12 +44,13 @@ class LemmatizeTextResource(Resource):
         """
         try:
             data: Dict[str, Any] = api.payload
-            text: str = data.get("text", "")
+            text: Union[str, List[str]] = data.get("text", "")
+            tokenizer: str = data.get("tokenizer", "treebank")
             
             if not text:
                 return {"error": "No text provided."}, 400
             
-            result = normalizer_utils.lemmatize_text(text)
+            result = normalizer_utils.lemmatize_text(text, tokenizer)
         
             return {"result": result}, 200
         
@@ -66,12 +68,15 @@ class NormalizeUnicodeResource(Resource):
         """
         try:
             data: Dict[str, Any] = api.payload
-            text: str = data.get("text", "")
+            text: Union[str, List[str]] = data.get("text", "")
+            form: str = data.get("form", "NFKD")
+            ascii_only: bool = data.get("ascii_only", True)
+            casefold: bool = data.get("casefold", False)
             
             if not text:
                 return {"error": "No text provided."}, 400
             
-            result = normalizer_utils.normalize_unicode(text)
+            result = normalizer_utils.normalize_unicode(text, form, ascii_only, casefold)
             return {"result": result}, 200
         
         except Exception as e:
@@ -88,7 +93,7 @@ class RemoveNumbersResource(Resource):
         """
         try:
             data: Dict[str, Any] = api.payload
-            text: str = data.get("text", "")
+            text: Union[str, List[str]] = data.get("text", "")
             
             if not text:
                 return {"error": "No text provided."}, 400
@@ -110,7 +115,7 @@ class RemovePunctutationResource(Resource):
         """
         try:
             data: Dict[str, Any] = api.payload
-            text: str = data.get("text", "")
+            text: Union[str, List[str]] = data.get("text", "")
             punctuations: str = data.get("punctuations", None)
             remove_duplicates: bool = data.get("remove_duplicates", False)
 
@@ -134,13 +139,14 @@ class StemWordsResource(Resource):
         """
         try:
             data: Dict[str, Any] = api.payload
-            text: str = data.get("text", "")
+            text: Union[str, List[str]] = data.get("text", "")
             stemmer: str = data.get("stemmer", "porter")
+            tokenizer: str = data.get("tokenizer", "treebank")
 
             if not text:
                 return {"error": "No text provided."}, 400
             
-            result = normalizer_utils.stem_text(text, stemmer)
+            result = normalizer_utils.stem_text(text, stemmer, tokenizer)
             return {"result": result}, 200
         
         except Exception as e:
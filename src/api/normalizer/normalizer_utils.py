@@ -1,70 +1,210 @@
 # Import standard libraries
+import functools
+import itertools
 import re
 import string
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 # Import third-party libraries
+import ahocorasick
 import contractions
 from nltk.stem import WordNetLemmatizer, PorterStemmer, LancasterStemmer, SnowballStemmer
-from nltk.tokenize import word_tokenize as _word_tokenize
-from unicodedata import normalize as _normalize
+from unicodedata import is_normalized as _is_normalized, normalize as _normalize
 
+# Import project code
+from api import batch, token_stream
+from api.token_stream import TokenStream
 
-def expand_contractions(text: str) -> str:
+_DIGITS_RE = re.compile(r'\d+')
+_DUPLICATE_PUNCTUATION_RE = re.compile(r'([\!\?\.\,\:\;]){2,}')
+
+# Maximum number of distinct tokens whose lemma or stem is memoized.
+TOKEN_CACHE_SIZE = 100000
+
+_NORMALIZATION_FORMS = ('NFC', 'NFKC', 'NFD', 'NFKD')
+
+_LEMMATIZER = WordNetLemmatizer()
+
+_STEMMERS = {
+    'snowball': SnowballStemmer('english'),
+    'porter': PorterStemmer(),
+    'lancaster': LancasterStemmer()
+}
+
+# One bounded token-to-stem cache per algorithm, wrapping the long-lived stemmer instances.
+_STEM_CACHES = {name: functools.lru_cache(maxsize=TOKEN_CACHE_SIZE)(stemmer.stem) for name, stemmer in _STEMMERS.items()}
+
+
+# Characters that may not border a contraction, as in contractions.fix.
+_WORD_CHARACTERS = frozenset(string.ascii_letters + string.digits + '_')
+
+
+@functools.lru_cache(maxsize=32)
+def _contractions_automaton(extra_contractions: Tuple[Tuple[str, str], ...] = ()) -> ahocorasick.Automaton:
+    """
+    Builds an Aho-Corasick automaton over the lowercased contractions used by contractions.fix, plus any extra ones.
+    Later entries override earlier ones, so extra contractions take precedence.
     """
-    Expands contractions in a given text.
+    automaton = ahocorasick.Automaton()
+    for mapping in (contractions.contractions_dict, contractions.leftovers_dict, contractions.slang_dict, dict(extra_contractions)):
+        for contraction, expansion in mapping.items():
+            automaton.add_word(contraction.lower(), (len(contraction), expansion))
+    automaton.make_automaton()
+    return automaton
+
+
+_contractions_automaton()
+
+
+def _sentence_case(text: str) -> str:
+    return text[:1].upper() + text[1:].lower()
+
+
+def _match_case(match: str, expansion: str) -> str:
+    if match == match.upper():
+        return expansion.upper()
+    if match == match.title():
+        return expansion.title()
+    if match == match.lower():
+        return expansion.lower()
+    if match == _sentence_case(match):
+        return _sentence_case(expansion)
+    return expansion
+
+
+def _expand_contractions(automaton: ahocorasick.Automaton, text: str) -> str:
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # A few characters lowercase to several, which would shift match positions.
+        lowered = ''.join(char if len(char.lower()) != 1 else char.lower() for char in text)
+
+    # Overlapping matches are resolved as in contractions.fix: a match overlapping the previous one replaces it if it is longer.
+    matches = []
+    current_stop = -1
+    for end, (length, expansion) in automaton.iter(lowered):
+        start, stop = end - length + 1, end + 1
+        if (stop != len(text) and text[stop] in _WORD_CHARACTERS) or (start and text[start - 1] in _WORD_CHARACTERS):
+            continue
+        if start >= current_stop:
+            current_stop = stop
+            matches.append((stop - start, start, stop, _match_case(text[start:stop], expansion)))
+        elif stop - start > matches[-1][0]:
+            current_stop = max(current_stop, stop)
+            matches[-1] = (current_stop - start, start, current_stop, _match_case(text[start:stop], expansion))
+
+    if not matches:
+        return text
+
+    parts = []
+    previous_stop = 0
+    for _, start, stop, expansion in matches:
+        parts.append(text[previous_stop:start])
+        parts.append(expansion)
+        previous_stop = stop
+    parts.append(text[previous_stop:])
+
+    return ''.join(parts)
+
+
+def expand_contractions(text: Union[str, List[str]], extra_contractions: Optional[Dict[str, str]] = None) -> Union[str, List[str]]:
+    """
+    Expands contractions in a given text. The text is scanned once by an automaton built over the whole contraction
+    dictionary, and expansions follow the case of the contraction. The output matches contractions.fix.
 
     Parameters:
-    - text (str): Text with potential contractions.
+    - text (Union[str, List[str]]): Text with potential contractions, or a list of texts.
+    - extra_contractions (Optional[Dict[str, str]]): Additional contractions mapped to their expansions. These take precedence over the built-in ones. Defaults to None.
 
     Returns:
-    - str: Text with contractions expanded.
+    - Union[str, List[str]]: Text with contractions expanded, or a list of such texts.
     """
-    return contractions.fix(text)
+    automaton = _contractions_automaton(tuple(sorted(extra_contractions.items())) if extra_contractions else ())
+    return batch.apply(functools.partial(_expand_contractions, automaton), text)
 
 
-def lemmatize_text(text: str) -> str:
+@functools.lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _lemmatize_token(token: str) -> str:
+    return _LEMMATIZER.lemmatize(token)
+
+
+def lemmatize_text(text: Union[str, List[str], TokenStream], tokenizer: str = 'treebank') -> Union[str, List[str], TokenStream]:
     """
-    Process words in given text using lemmatization.
+    Process words in given text using lemmatization. A process-wide lemmatizer is used and lemmas are memoized per
+    token. For a list of texts, each distinct token in the whole batch is lemmatized once.
 
     Parameters:
-    - text (str): The input text.
+    - text (Union[str, List[str], TokenStream]): The input text, a list of texts, or an already tokenized token stream.
+    - tokenizer (str): The word tokenizer used for text. Options are 'treebank' and 'regex'. Default is 'treebank'.
 
     Returns:
-    - str: The lemmatized text.
+    - Union[str, List[str], TokenStream]: The lemmatized text, a list of lemmatized texts, or a token stream if a token stream was given.
     """
-    lemmatizer = WordNetLemmatizer()
-    tokens = _word_tokenize(text)
-    lemmatized_words = [lemmatizer.lemmatize(token) for token in tokens]
-    return ' '.join(lemmatized_words)
+    if batch.is_batch(text):
+        tokenized = batch.map_unique(functools.partial(token_stream.tokens_of, tokenizer=tokenizer), text)
+        lemmas = {token: _lemmatize_token(token) for token in set(itertools.chain.from_iterable(tokenized))}
+        return [' '.join([lemmas[token] for token in tokens]) for tokens in tokenized]
+
+    tokens = token_stream.tokens_of(text, tokenizer)
+    lemmatized_words = [_lemmatize_token(token) for token in tokens]
+    return token_stream.like_input(text, lemmatized_words)
 
 
-def normalize_unicode(text: str) -> str:
+def normalize_unicode(text: Union[str, List[str]], form: str = 'NFKD', ascii_only: bool = True, casefold: bool = False) -> Union[str, List[str]]:
     """
-    This method normalizes unicode characters in given text to remove umlauts, accents, etc.
+    This method normalizes unicode characters in given text to remove umlauts, accents, etc. ASCII text is already
+    normalized in every form, so it is returned without being normalized.
 
     Parameters:
-    - text (str): The input text to normalize unicode.
+    - text (Union[str, List[str]]): The input text to normalize unicode, or a list of texts.
+    - form (str): The normalization form. Options are 'NFC', 'NFKC', 'NFD', and 'NFKD'. Default is 'NFKD'.
+    - ascii_only (bool): If True, characters that are not ASCII after normalization are removed. Default is True.
+    - casefold (bool): If True, the normalized text is also casefolded. Default is False.
 
     Returns:
-    - str: The text with normalized unicode characters.
+    - Union[str, List[str]]: The text with normalized unicode characters, or a list of such texts.
     """
-    return _normalize('NFKD', text).encode('ASCII', 'ignore').decode('utf-8')
+    form = form.upper()
+    if form not in _NORMALIZATION_FORMS:
+        raise ValueError(
+            f"Unsupported form '{form}'. Supported forms are: {', '.join(_NORMALIZATION_FORMS)}")
 
+    def process(s: str) -> str:
+        if s.isascii():
+            return s.lower() if casefold else s
 
+        if ascii_only:
+            normalized = _normalize(form, s).encode('ASCII', 'ignore').decode('ASCII')
+            return normalized.lower() if casefold else normalized
 
+        normalized = _normalize(form, s)
+        if casefold:
+            normalized = normalized.casefold()
+            if not _is_normalized(form, normalized):
+                normalized = _normalize(form, normalized)
+        return normalized
 
-def remove_numbers(text: str) -> str:
+    return batch.apply(process, text)
+
+
+def remove_numbers(text: Union[str, List[str]]) -> Union[str, List[str]]:
     """
     Remove all numbers from the text.
 
     Paramters:
-    - text (str): Input string.
+    - text (Union[str, List[str]]): Input string, or a list of strings.
 
     Returns:
-    - str: Text without numbers.
+    - Union[str, List[str]]: Text without numbers, or a list of such texts.
     """
-    return re.sub('\d+', '', text)
+    def process(s: str) -> str:
+        return _DIGITS_RE.sub('', s)
+
+    return batch.apply(process, text)
+
+
+@functools.lru_cache(maxsize=256)
+def _punctuation_table(punctuations: str) -> dict:
+    return str.maketrans('', '', punctuations)
 
 
 def remove_punctuation(text: Union[str, List[str]], punctuations: Optional[str] = None, remove_duplicates: Optional[bool] = False) -> Union[str, List[str]]:
@@ -82,39 +222,42 @@ def remove_punctuation(text: Union[str, List[str]], punctuations: Optional[str]
     if punctuations is None:
         punctuations = string.punctuation
 
+    table = _punctuation_table(punctuations)
+
     def process(s: str) -> str:
-        no_punct = s.translate(str.maketrans('', '', punctuations))
-        return re.sub(r'([\!\?\.\,\:\;]){2,}', r'\1', no_punct) if remove_duplicates else no_punct
+        no_punct = s.translate(table)
+        return _DUPLICATE_PUNCTUATION_RE.sub(r'\1', no_punct) if remove_duplicates else no_punct
 
-    if isinstance(text, list):
-        return [process(s) for s in text]
-    else:
-        return process(text)
+    return batch.apply(process, text)
 
 
-def stem_text(text: str, stemmer: str = 'porter') -> str:
+def stem_text(text: Union[str, List[str], TokenStream], stemmer: str = 'porter', tokenizer: str = 'treebank') -> Union[str, List[str], TokenStream]:
     """
-    Process words in given text using stemming.
+    Process words in given text using stemming. Stems are memoized per algorithm and only the distinct tokens of a
+    text, or of a whole list of texts, are stemmed.
 
     Parameters:
-    - text (str): The input text.
+    - text (Union[str, List[str], TokenStream]): The input text, a list of texts, or an already tokenized token stream.
     - stemmer (str): The stemmer algorithm to use. Options are 'snowball', 'porter', and 'lancaster'. Default is 'porter'.
+    - tokenizer (str): The word tokenizer used for text. Options are 'treebank' and 'regex'. Default is 'treebank'.
 
     Returns:
-    - str: The stemmed text.
+    - Union[str, List[str], TokenStream]: The stemmed text, a list of stemmed texts, or a token stream if a token stream was given.
     """
-    supported_stemmers = {
-        'snowball': SnowballStemmer('english'),
-        'porter': PorterStemmer(),
-        'lancaster': LancasterStemmer()
-    }
     stemmer = stemmer.lower()
-    if stemmer not in supported_stemmers:
+    if stemmer not in _STEMMERS:
         raise ValueError(
-            f"Unsupported stemmer '{stemmer}'. Supported stemmers are: {', '.join(supported_stemmers.keys())}")
+            f"Unsupported stemmer '{stemmer}'. Supported stemmers are: {', '.join(_STEMMERS.keys())}")
+
+    stem = _STEM_CACHES[stemmer]
+
+    if batch.is_batch(text):
+        tokenized = batch.map_unique(functools.partial(token_stream.tokens_of, tokenizer=tokenizer), text)
+        stems = {token: stem(token) for token in set(itertools.chain.from_iterable(tokenized))}
+        return [' '.join([stems[token] for token in tokens]) for tokens in tokenized]
 
-    tokens = _word_tokenize(text)
-    stemmed_words = [supported_stemmers[stemmer].stem(
-        token) for token in tokens]
+    tokens = token_stream.tokens_of(text, tokenizer)
+    stems = {token: stem(token) for token in set(tokens)}
+    stemmed_words = [stems[token] for token in tokens]
 
-    return ' '.join(stemmed_words)
+    return token_stream.like_input(text, stemmed_words)
@@ -10,8 +10,42 @@ custom_pipeline_model = processor_ns.model("CustomPipeline", {
     "text": fields.String(required=True, description="The input text."),
     "operations": fields.List(fields.String, required=True, description="An ordered series of text processing operations to run on the input text."),
     "args": fields.Nested(api.model('OperationArgs', {}), required=False, description="Arguments for the operations. Key is operation name, value is a dictionary of arguments for that operation."),
+    "cache": fields.Boolean(required=False, description="If True, the result is served from and stored in the result cache. Defaults to False."),
+    "profile": fields.Boolean(required=False, description="If True, the response includes per-stage timing, length and memory measurements. Bypasses the result cache. Defaults to False."),
+    "incremental": fields.Boolean(required=False, description="If True, only paragraphs that were not processed before run through the pipeline. Defaults to False."),
 })
 
 default_pipeline_model = processor_ns.model("DefaultPipeline", {
-    "text": fields.String(required=True, description="The input text.")
+    "text": fields.String(required=True, description="The input text."),
+    "cache": fields.Boolean(required=False, description="If True, the result is served from and stored in the result cache. Defaults to False."),
+    "profile": fields.Boolean(required=False, description="If True, the response includes per-stage timing, length and memory measurements. Bypasses the result cache. Defaults to False."),
+    "incremental": fields.Boolean(required=False, description="If True, only paragraphs that were not processed before run through the pipeline. Defaults to False."),
+})
+
+custom_pipeline_batch_model = processor_ns.model("CustomPipelineBatch", {
+    "texts": fields.List(fields.String, required=True, description="The input documents."),
+    "operations": fields.List(fields.String, required=True, description="An ordered series of text processing operations to run on each document."),
+    "args": fields.Nested(api.model('BatchOperationArgs', {}), required=False, description="Arguments for the operations. Key is operation name, value is a dictionary of arguments for that operation."),
+    "cache": fields.Boolean(required=False, description="If True, results are served from and stored in the result cache. Defaults to False."),
+})
+
+default_pipeline_batch_model = processor_ns.model("DefaultPipelineBatch", {
+    "texts": fields.List(fields.String, required=True, description="The input documents."),
+    "cache": fields.Boolean(required=False, description="If True, results are served from and stored in the result cache. Defaults to False."),
+})
+
+job_model = processor_ns.model("Job", {
+    "text": fields.String(required=True, description="The input text."),
+    "operations": fields.List(fields.String, required=False, description="An ordered series of text processing operations to run on the input text. If omitted, the default pipeline is used."),
+    "args": fields.Nested(api.model('JobOperationArgs', {}), required=False, description="Arguments for the operations. Key is operation name, value is a dictionary of arguments for that operation."),
+})
+
+register_pipeline_model = processor_ns.model("RegisterPipeline", {
+    "operations": fields.List(fields.String, required=True, description="An ordered series of text processing operations to run on the input text."),
+    "args": fields.Nested(api.model('RegisteredOperationArgs', {}), required=False, description="Arguments for the operations. Key is operation name, value is a dictionary of arguments for that operation."),
+})
+
+run_pipeline_model = processor_ns.model("RunPipeline", {
+    "text": fields.String(required=True, description="The input text."),
+    "cache": fields.Boolean(required=False, description="If True, the result is served from and stored in the result cache. Defaults to False."),
 })
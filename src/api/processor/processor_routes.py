@@ -1,4 +1,6 @@
 # Import third-party libraries
+import inspect
+from flask import Response, request, stream_with_context
 from flask_restx import Resource
 from typing import Dict, Any
 
@@ -39,6 +41,9 @@ class CustomPipelineResource(Resource):
         text: str = data.get("text", "")
         operations: list = data.get("operations", [])
         args: dict = data.get("args", {})
+        cache: bool = data.get("cache", False)
+        profile: bool = data.get("profile", False)
+        incremental: bool = data.get("incremental", False)
 
         if not text:
             logger.error("No text provided.")
@@ -49,7 +54,17 @@ class CustomPipelineResource(Resource):
             return {"error": "No operations provided."}, 400
         
         try:
-            result = processor_utils.custom_pipeline(text, operations, args)
+            if profile:
+                result, stages = processor_utils.profile_pipeline(text, operations, args)
+                return {"result": result, "profile": stages}, 200
+
+            if incremental:
+                result = processor_utils.incremental_pipeline(text, operations, args)
+            else:
+                result = processor_utils.custom_pipeline(text, operations, args, cache)
+        except ValueError as e:
+            logger.error(f"Invalid pipeline: {str(e)}")
+            return {"error": str(e)}, 400
         except Exception as e:
             logger.error(f"An error occurred during processing: {str(e)}")
             return {"error": str(e)}, 500    
@@ -65,16 +80,232 @@ class DefaultPipelineResource(Resource):
         """
         data: Dict[str, Any] = api.payload
         text: str = data.get("text", "")
+        cache: bool = data.get("cache", False)
+        profile: bool = data.get("profile", False)
+        incremental: bool = data.get("incremental", False)
 
         if not text:
             logger.error("No text provided.")
             return {"error": "No text provided."}, 400
         
         try:
-            result = processor_utils.default_pipeline(text)
+            if profile:
+                result, stages = processor_utils.profile_pipeline(text)
+                return {"result": result, "profile": stages}, 200
+
+            if incremental:
+                result = processor_utils.incremental_pipeline(text)
+            else:
+                result = processor_utils.default_pipeline(text, cache)
         except Exception as e:
             logger.error(f"An error occurred during processing: {str(e)}")
             return {"error": str(e)}, 500
         
         return {"result": result}, 200
         
+
+@processor_ns.route("/custom-pipeline/batch")
+class CustomPipelineBatchResource(Resource):
+    @processor_ns.expect(custom_pipeline_batch_model)
+    def post(self):
+        """
+        Applies a custom ordered series of text processing operations to a batch of documents.
+        """
+        data: Dict[str, Any] = api.payload
+        texts: list = data.get("texts", [])
+        operations: list = data.get("operations", [])
+        args: dict = data.get("args", {})
+        cache: bool = data.get("cache", False)
+
+        if not texts:
+            logger.error("No texts provided.")
+            return {"error": "No texts provided."}, 400
+
+        if not operations:
+            logger.error("No operations provided.")
+            return {"error": "No operations provided."}, 400
+
+        try:
+            results = processor_utils.batch_pipeline(texts, operations, args, cache)
+        except ValueError as e:
+            logger.error(f"Invalid batch: {str(e)}")
+            return {"error": str(e)}, 400
+        except Exception as e:
+            logger.error(f"An error occurred during processing: {str(e)}")
+            return {"error": str(e)}, 500
+
+        return {"results": results}, 200
+
+@processor_ns.route("/default-pipeline/batch")
+class DefaultPipelineBatchResource(Resource):
+    @processor_ns.expect(default_pipeline_batch_model)
+    def post(self):
+        """
+        Applies a preset ordered series of text processing operations to a batch of documents.
+        """
+        data: Dict[str, Any] = api.payload
+        texts: list = data.get("texts", [])
+        cache: bool = data.get("cache", False)
+
+        if not texts:
+            logger.error("No texts provided.")
+            return {"error": "No texts provided."}, 400
+
+        try:
+            results = processor_utils.batch_pipeline(texts, use_cache=cache)
+        except ValueError as e:
+            logger.error(f"Invalid batch: {str(e)}")
+            return {"error": str(e)}, 400
+        except Exception as e:
+            logger.error(f"An error occurred during processing: {str(e)}")
+            return {"error": str(e)}, 500
+
+        return {"results": results}, 200
+
+@processor_ns.route("/stream")
+class StreamPipelineResource(Resource):
+    @processor_ns.doc(description=inspect.getdoc(processor_utils.stream_pipeline), consumes=["application/x-ndjson"])
+    def post(self):
+        """
+        Applies a pipeline to each record of a newline-delimited JSON request body and streams back one result per record.
+        """
+        results = processor_utils.stream_pipeline(request.stream)
+        return Response(stream_with_context(results), mimetype="application/x-ndjson")
+
+@processor_ns.route("/cache")
+class ResultCacheResource(Resource):
+    def get(self):
+        """
+        Displays the size and hit, miss and eviction counters of the pipeline result cache.
+        """
+        return processor_utils.result_cache_stats(), 200
+
+    def delete(self):
+        """
+        Removes every entry from the pipeline result cache.
+        """
+        processor_utils.clear_result_cache()
+        return "", 204
+
+@processor_ns.route("/jobs")
+class JobsResource(Resource):
+    @processor_ns.expect(job_model)
+    def post(self):
+        """
+        Submits a text processing pipeline to run in the background and returns a job id to poll.
+        """
+        data: Dict[str, Any] = api.payload
+        text: str = data.get("text", "")
+        operations: list = data.get("operations", None)
+        args: dict = data.get("args", {})
+
+        if not text:
+            logger.error("No text provided.")
+            return {"error": "No text provided."}, 400
+
+        try:
+            job_id = processor_utils.submit_job(text, operations, args)
+        except ValueError as e:
+            logger.error(f"Invalid pipeline: {str(e)}")
+            return {"error": str(e)}, 400
+        except RuntimeError as e:
+            logger.error(f"Job rejected: {str(e)}")
+            return {"error": str(e)}, 503
+        except Exception as e:
+            logger.error(f"An error occurred while submitting the job: {str(e)}")
+            return {"error": str(e)}, 500
+
+        return {"job_id": job_id, "status": "pending"}, 202
+
+@processor_ns.route("/jobs/<string:job_id>")
+class JobResource(Resource):
+    def get(self, job_id: str):
+        """
+        Displays the status of a background job and, once it has finished, its result.
+        """
+        status = processor_utils.job_status(job_id)
+
+        if status is None:
+            return {"error": f"Unknown or expired job: {job_id}"}, 404
+
+        return status, 200
+
+@processor_ns.route("/pipelines")
+class PipelinesResource(Resource):
+    @processor_ns.expect(register_pipeline_model)
+    def post(self):
+        """
+        Validates, precompiles and registers a pipeline, returning an id to invoke it by.
+        """
+        data: Dict[str, Any] = api.payload
+        operations: list = data.get("operations", [])
+        args: dict = data.get("args", {})
+
+        if not operations:
+            logger.error("No operations provided.")
+            return {"error": "No operations provided."}, 400
+
+        try:
+            pipeline_id = processor_utils.register_pipeline(operations, args)
+        except ValueError as e:
+            logger.error(f"Invalid pipeline: {str(e)}")
+            return {"error": str(e)}, 400
+        except RuntimeError as e:
+            logger.error(f"Pipeline rejected: {str(e)}")
+            return {"error": str(e)}, 503
+        except Exception as e:
+            logger.error(f"An error occurred while registering the pipeline: {str(e)}")
+            return {"error": str(e)}, 500
+
+        return {"pipeline_id": pipeline_id}, 201
+
+@processor_ns.route("/pipelines/<string:pipeline_id>")
+class PipelineResource(Resource):
+    def get(self, pipeline_id: str):
+        """
+        Displays the operations and arguments of a registered pipeline.
+        """
+        pipeline = processor_utils.get_pipeline(pipeline_id)
+
+        if pipeline is None:
+            return {"error": f"Unknown pipeline: {pipeline_id}"}, 404
+
+        return pipeline, 200
+
+    def delete(self, pipeline_id: str):
+        """
+        Unregisters a pipeline.
+        """
+        if not processor_utils.delete_pipeline(pipeline_id):
+            return {"error": f"Unknown pipeline: {pipeline_id}"}, 404
+
+        return "", 204
+
+@processor_ns.route("/pipelines/<string:pipeline_id>/run")
+class RunPipelineResource(Resource):
+    @processor_ns.expect(run_pipeline_model)
+    def post(self, pipeline_id: str):
+        """
+        Applies a registered pipeline to the input text.
+        """
+        data: Dict[str, Any] = api.payload
+        text: str = data.get("text", "")
+        cache: bool = data.get("cache", False)
+
+        if not text:
+            logger.error("No text provided.")
+            return {"error": "No text provided."}, 400
+
+        if processor_utils.get_pipeline(pipeline_id) is None:
+            return {"error": f"Unknown pipeline: {pipeline_id}"}, 404
+
+        try:
+            result = processor_utils.run_registered_pipeline(text, pipeline_id, cache)
+        except ValueError as e:
+            logger.error(f"Invalid pipeline: {str(e)}")
+            return {"error": str(e)}, 400
+        except Exception as e:
+            logger.error(f"An error occurred during processing: {str(e)}")
+            return {"error": str(e)}, 500
+
+        return {"result": result}, 200
@@ -1,24 +1,251 @@
 # Import standard libraries
+import copy
+import functools
+import hashlib
 import inspect
+import itertools
+import json
+import mmap
+import multiprocessing
+import os
+import re
+import shutil
+import string
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# Import third-party libraries
+import numpy as np
 
 # Import project code
+from api import token_stream
 from api.encoder import encoder_utils
 from api.flattener import flattener_utils
 from api.normalizer import normalizer_utils
 from api.segmenter import segmenter_utils
+from api.token_stream import TokenStream
 from api.transformer import transformer_utils
 from log_config import Logger
 
 logger = Logger().get_logger()
 
 utils = {
-    "encoder": encoder_utils, 
-    "flattener": flattener_utils, 
-    "normalizer": normalizer_utils, 
-    "segmenter": segmenter_utils, 
+    "encoder": encoder_utils,
+    "flattener": flattener_utils,
+    "normalizer": normalizer_utils,
+    "segmenter": segmenter_utils,
     "transformer": transformer_utils
 }
 
+# Maximum number of compiled pipelines kept in memory.
+PIPELINE_CACHE_SIZE = 256
+
+# Number of worker processes used for batch execution. Defaults to the number of CPUs.
+BATCH_WORKERS = int(os.environ.get("PROCESSOR_BATCH_WORKERS", "0")) or os.cpu_count() or 1
+
+# Batches smaller than this run in the calling process, where pool start-up and IPC would dominate.
+BATCH_POOL_THRESHOLD = 32
+
+# Maximum number of documents accepted in a single batch.
+BATCH_MAX_SIZE = 10000
+
+DEFAULT_OPERATIONS = [
+    "expand_contractions",
+    "change_case",
+    "handle_line_feeds",
+    "remove_whitespace",
+    "remove_special_characters",
+    "remove_punctuation",
+]
+
+DEFAULT_ARGS = {
+    "change_case": {
+        "case": "lower"
+        }
+}
+
+# Maximum size in bytes of a single record in a streamed NDJSON request body.
+STREAM_MAX_RECORD_SIZE = 16 * 1024 * 1024
+
+# Upper bound on the number of code points memoized by a fused character table.
+FUSED_TABLE_SIZE = 65536
+
+# Memory bound in bytes and time-to-live in seconds of the opt-in pipeline result cache.
+RESULT_CACHE_MAX_BYTES = int(os.environ.get("PROCESSOR_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+RESULT_CACHE_TTL = float(os.environ.get("PROCESSOR_CACHE_TTL", "3600"))
+
+# Memory bound in bytes of the per-paragraph cache used by incremental processing. Shares the result cache TTL.
+PARAGRAPH_CACHE_MAX_BYTES = int(os.environ.get("PROCESSOR_PARAGRAPH_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Seconds a finished job and its result are kept before they expire, and the maximum number of tracked jobs.
+JOB_RESULT_TTL = float(os.environ.get("PROCESSOR_JOB_TTL", "600"))
+JOB_MAX_JOBS = 1000
+
+# Size in bytes of the line-aligned chunks read from memory-mapped input files.
+FILE_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Directory where registered pipelines are persisted, so every worker process can load and precompile them. It
+# defaults to the instance folder of the application, which is created readable by its owner only.
+PIPELINE_REGISTRY_DIR = os.environ.get(
+    "PROCESSOR_REGISTRY_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "instance", "pipelines"))
+
+# Maximum number of registered pipelines.
+PIPELINE_REGISTRY_MAX = int(os.environ.get("PROCESSOR_REGISTRY_MAX", "1000"))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+_registry = {}
+
+# tracemalloc is process-wide, so only one profiled run traces allocations at a time.
+_profile_lock = threading.Lock()
+_registry_lock = threading.Lock()
+_registry_loaded = False
+_PIPELINE_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+# A line break followed by one or more blank lines. Paragraphs keep their trailing separator, so every piece of a split
+# document is a run of whole lines.
+_PARAGRAPH_SEPARATOR_RE = re.compile(r'(\n(?:[^\S\n]*\n)+)')
+
+_DIGIT_RE = re.compile(r'\d')
+_WORD_OR_SPACE_RE = re.compile(r'[\w\s]')
+_CAPITAL_SIGMA = '\u03a3'
+
+# Result types of segmenter operations, such as offset arrays and shingle hashes, that are converted to lists so results
+# can be serialized.
+_ARRAY_TYPES = (array, np.ndarray)
+
+
+# Operations that accept a token stream in place of text, so consecutive ones can share a single tokenization.
+_TOKEN_OPERATIONS = {"lemmatize_text", "remove_stopwords", "stem_text"}
+
+# Operations whose output on a text equals the concatenation of their outputs on its lines, given their arguments.
+# Files are processed in line-aligned chunks, so only these operations are allowed there.
+_LINE_LOCAL_OPERATIONS = {
+    "change_case": lambda case='lower': case in ('lower', 'upper', 'title'),
+    "expand_contractions": lambda extra_contractions=None: not any('\n' in key for key in extra_contractions or ()),
+    "handle_line_feeds": lambda mode='remove': True,
+    "normalize_unicode": lambda form='NFKD', ascii_only=True, casefold=False: True,
+    "remove_brackets": lambda: True,
+    "remove_numbers": lambda: True,
+    "remove_punctuation": lambda punctuations=None, remove_duplicates=False: True,
+    "remove_special_characters": lambda remove_unicode=False, custom_characters=None: True,
+}
+
+
+class _Stage(NamedTuple):
+    """
+    A single step of a compiled pipeline.
+    """
+    name: str
+    func: Callable
+    token_level: bool = False
+    tokenizer: str = 'treebank'
+
+
+class _ResultCache:
+    """
+    A thread-safe LRU cache of pipeline results keyed by a hash of the pipeline spec and the input text, bounded by the
+    approximate memory held by its values and expiring entries after a time-to-live. Results other than strings are
+    copied on the way in and out, so callers that mutate a result do not change what later hits return.
+    """
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(spec: str, text: str) -> str:
+        digest = hashlib.blake2b(spec.encode("utf-8"), digest_size=16)
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    @staticmethod
+    def _sizeof(value: Any) -> int:
+        # Containers such as n-gram lists and count mappings are sized with everything they hold.
+        if isinstance(value, dict):
+            return sys.getsizeof(value) + sum(_ResultCache._sizeof(key) + _ResultCache._sizeof(item)
+                                              for key, item in value.items())
+        if isinstance(value, (list, tuple)):
+            return sys.getsizeof(value) + sum(_ResultCache._sizeof(item) for item in value)
+        return sys.getsizeof(value)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            value = entry[1]
+
+        return True, value if isinstance(value, str) else copy.deepcopy(value)
+
+    def put(self, key: str, value: Any) -> None:
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            return
+
+        if not isinstance(value, str):
+            value = copy.deepcopy(value)
+
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (time.monotonic() + self.ttl, value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self.entries.pop(key)
+        self.size -= size
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "size_bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_result_cache = _ResultCache(RESULT_CACHE_MAX_BYTES, RESULT_CACHE_TTL)
+_paragraph_cache = _ResultCache(PARAGRAPH_CACHE_MAX_BYTES, RESULT_CACHE_TTL)
+
 
 def list_available_methods():
     """
@@ -27,18 +254,294 @@ def list_available_methods():
     Returns:
     - list: The names of all available methods.
     """
-    available_methods = []
-    
-    for _, module in utils.items():
-        available_methods.extend([name for name, _ in inspect.getmembers(module, inspect.isfunction) 
-                                  if not name.startswith("_")])
-    
+    available_methods = list(_available_operations().keys())
     available_methods.sort()
 
     return available_methods
 
 
-def custom_pipeline(text: str, operations: list, args: dict) -> str:
+@functools.lru_cache(maxsize=None)
+def _available_operations() -> Dict[str, Callable]:
+    """
+    Maps every public util function to its name. The first module in `utils` wins on name clashes.
+    """
+    operations = {}
+
+    for _, module in utils.items():
+        for name, func in inspect.getmembers(module, inspect.isfunction):
+            if not name.startswith("_"):
+                operations.setdefault(name, func)
+
+    return operations
+
+
+def _canonical_spec(operations: List[str], args: Optional[dict]) -> str:
+    """
+    Serializes a pipeline into a stable string, ignoring arguments for operations that are not in the pipeline.
+    """
+    if not isinstance(operations, (list, tuple)) or not all(isinstance(op, str) for op in operations):
+        raise ValueError("Operations must be a list of operation names.")
+
+    args = args or {}
+    used_args = {operation: args[operation] for operation in operations if operation in args}
+
+    try:
+        return json.dumps([list(operations), used_args], sort_keys=True, separators=(",", ":"))
+    except TypeError as e:
+        raise ValueError(f"Pipeline arguments must be JSON serializable: {str(e)}")
+
+
+def _bind_operation(operation: str, operation_args: dict) -> Callable:
+    """
+    Resolves an operation name and binds its arguments, validating them against the function signature.
+    """
+    operation_func = _available_operations().get(operation)
+    if operation_func is None:
+        raise ValueError(f"Invalid operation specified: {operation}")
+
+    if not isinstance(operation_args, dict):
+        raise ValueError(f"Arguments for operation '{operation}' must be an object.")
+
+    try:
+        inspect.signature(operation_func).bind(None, **operation_args)
+    except TypeError as e:
+        raise ValueError(f"Invalid arguments for operation '{operation}': {str(e)}")
+
+    if not operation_args:
+        return operation_func
+
+    return functools.partial(operation_func, **operation_args)
+
+
+def _change_case_mapper(case: str) -> Optional[Callable[[str], str]]:
+    # str.lower() is context-free except for the final form of capital sigma, which _FusedStage guards against.
+    return {'lower': str.lower, 'upper': str.upper}.get(case)
+
+
+def _handle_line_feeds_mapper(mode: str) -> Optional[Callable[[str], str]]:
+    if mode != 'remove':
+        return None
+    return lambda char: ' ' if char == '\n' else '' if char == '\r' else char
+
+
+def _remove_numbers_mapper() -> Callable[[str], str]:
+    return lambda char: '' if _DIGIT_RE.match(char) else char
+
+
+def _remove_punctuation_mapper(punctuations: Optional[str], remove_duplicates: bool) -> Optional[Callable[[str], str]]:
+    if remove_duplicates:
+        return None
+    punctuations = string.punctuation if punctuations is None else punctuations
+    return lambda char: '' if char in punctuations else char
+
+
+def _remove_special_characters_mapper(remove_unicode: bool, custom_characters: Optional[str]) -> Callable[[str], str]:
+    if remove_unicode:
+        return lambda char: char if ord(char) < 128 and _WORD_OR_SPACE_RE.match(char) else ''
+    if custom_characters is not None:
+        return lambda char: '' if char in custom_characters else char
+    return lambda char: char if _WORD_OR_SPACE_RE.match(char) else ''
+
+
+# Operations whose effect can be expressed as an independent mapping of every character, given their arguments.
+# Each factory returns None when the arguments make the operation context dependent.
+_char_mappers = {
+    "change_case": _change_case_mapper,
+    "handle_line_feeds": _handle_line_feeds_mapper,
+    "remove_numbers": _remove_numbers_mapper,
+    "remove_punctuation": _remove_punctuation_mapper,
+    "remove_special_characters": _remove_special_characters_mapper,
+}
+
+
+class _CharTable(dict):
+    """
+    A str.translate table that composes several character mappings, memoizing each code point on first sight.
+    """
+    def __init__(self, mappers: List[Callable[[str], str]]):
+        super().__init__()
+        self.mappers = mappers
+        for codepoint in range(128):
+            self[codepoint]
+
+    def __missing__(self, codepoint: int) -> str:
+        chars = chr(codepoint)
+        for mapper in self.mappers:
+            chars = ''.join(mapper(char) for char in chars)
+        # None rather than '' marks a deletion, which keeps str.translate on its fast path for ASCII input.
+        value = chars or None
+        if len(self) < FUSED_TABLE_SIZE:
+            self[codepoint] = value
+        return value
+
+
+class _FusedStage:
+    """
+    Runs a run of adjacent character-level operations as a single str.translate pass.
+    """
+    def __init__(self, operations: List[str], funcs: List[Callable], mappers: List[Callable[[str], str]]):
+        self.funcs = funcs
+        self.table = _CharTable(mappers)
+        self.guard_sigma = "change_case" in operations
+
+    def __call__(self, text):
+        if not isinstance(text, str) or (self.guard_sigma and _CAPITAL_SIGMA in text):
+            for func in self.funcs:
+                text = func(text)
+            return text
+        return text.translate(self.table)
+
+
+def _char_mapper(operation: str, operation_args: dict) -> Optional[Callable[[str], str]]:
+    factory = _char_mappers.get(operation)
+    if factory is None:
+        return None
+
+    bound = inspect.signature(_available_operations()[operation]).bind(None, **operation_args)
+    bound.apply_defaults()
+    return factory(**{name: value for name, value in bound.arguments.items() if name != 'text'})
+
+
+def _fuse_stages(stages: List[Tuple[_Stage, Optional[Callable[[str], str]]]]) -> Tuple[_Stage, ...]:
+    """
+    Collapses runs of two or more adjacent character-level stages into one fused stage.
+    """
+    plan = []
+
+    for is_char_level, group in itertools.groupby(stages, key=lambda item: item[1] is not None):
+        group = list(group)
+        if not is_char_level or len(group) == 1:
+            plan.extend(stage for stage, _ in group)
+            continue
+        operations = [stage.name for stage, _ in group]
+        fused = _FusedStage(operations, [stage.func for stage, _ in group], [mapper for _, mapper in group])
+        plan.append(_Stage("+".join(operations), fused))
+
+    return tuple(plan)
+
+
+@functools.lru_cache(maxsize=PIPELINE_CACHE_SIZE)
+def _compile_spec(spec: str) -> Tuple[_Stage, ...]:
+    operations, args = json.loads(spec)
+    stages = []
+
+    for operation in operations:
+        operation_args = args.get(operation, {})
+        stage = _Stage(operation, _bind_operation(operation, operation_args), operation in _TOKEN_OPERATIONS,
+                       operation_args.get('tokenizer', 'treebank'))
+        stages.append((stage, _char_mapper(operation, operation_args)))
+
+    return _fuse_stages(stages)
+
+
+def compile_pipeline(operations: List[str], args: Optional[dict] = None) -> Tuple[_Stage, ...]:
+    """
+    This method compiles an ordered series of operations into a plan of pre-bound callables. Adjacent operations that
+    map characters independently are fused into a single pass over the text. Plans are kept in a bounded LRU cache
+    keyed by the canonical pipeline spec, so resolution and validation are only paid once per pipeline.
+
+    Parameters:
+    - operations (list): An ordered list of operations to run on the text.
+    - args (Optional[dict]): A dictionary mapping operations to their arguments. Defaults to None.
+
+    Returns:
+    - Tuple[_Stage, ...]: The compiled pipeline plan.
+
+    Raises:
+    ValueError: If an operation does not exist or its arguments do not match its signature.
+    """
+    return _compile_spec(_canonical_spec(operations, args))
+
+
+def _run_stage(stage: _Stage, value: Any) -> Any:
+    if stage.token_level:
+        if isinstance(value, str):
+            value = token_stream.tokenize(value, stage.tokenizer)
+    elif isinstance(value, TokenStream):
+        value = value.to_text()
+
+    return stage.func(value)
+
+
+def _profile_stage(stage: _Stage, value: Any, profile: List[dict]) -> Any:
+    """
+    Runs one stage while recording its wall time, CPU time, input and output length and peak traced allocation.
+    """
+    if hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+    else:
+        tracemalloc.clear_traces()
+    baseline = tracemalloc.get_traced_memory()[0]
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+
+    result = _run_stage(stage, value)
+
+    wall_time, cpu_time = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    peak = tracemalloc.get_traced_memory()[1]
+
+    profile.append({
+        "operation": stage.name,
+        "wall_time_ms": round(wall_time * 1000, 3),
+        "cpu_time_ms": round(cpu_time * 1000, 3),
+        "input_length": len(value),
+        "output_length": len(result),
+        "peak_memory_bytes": max(peak - baseline, 0),
+    })
+
+    return result
+
+
+def _run_plan(plan: Tuple[_Stage, ...], text: str, profile: Optional[List[dict]] = None) -> str:
+    """
+    Runs a compiled plan. Text is tokenized on entering a token-level stage, with that stage's tokenizer, and the
+    tokens flow on to following token-level stages; they are joined back into text only before a character-level stage
+    or at the end. When a profile list is given, one measurement per stage is appended to it.
+    """
+    result = text
+
+    if profile is None:
+        for stage in plan:
+            result = _run_stage(stage, result)
+    else:
+        with _profile_lock:
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            try:
+                for stage in plan:
+                    result = _profile_stage(stage, result, profile)
+            finally:
+                if started_tracing:
+                    tracemalloc.stop()
+
+    if isinstance(result, TokenStream):
+        result = result.to_text()
+    elif isinstance(result, _ARRAY_TYPES):
+        result = result.tolist()
+    elif isinstance(result, list) and any(isinstance(item, _ARRAY_TYPES) for item in result):
+        result = [item.tolist() if isinstance(item, _ARRAY_TYPES) else item for item in result]
+
+    return result
+
+
+def _execute(spec: str, text: str, use_cache: bool = False, plan: Optional[Tuple[_Stage, ...]] = None) -> Any:
+    """
+    Runs the pipeline described by a canonical spec, consulting the result cache first when asked to. The plan is only
+    compiled, or looked up, if the result is not served from the cache.
+    """
+    if not use_cache or not isinstance(text, str):
+        return _run_plan(plan if plan is not None else _compile_spec(spec), text)
+
+    key = _result_cache.key(spec, text)
+    found, result = _result_cache.get(key)
+    if not found:
+        result = _run_plan(plan if plan is not None else _compile_spec(spec), text)
+        _result_cache.put(key, result)
+
+    return result
+
+
+def custom_pipeline(text: str, operations: list, args: dict, use_cache: bool = False) -> str:
     """
     This method applies a custom ordered series of text processing operations to the input text.
 
@@ -46,64 +549,687 @@ def custom_pipeline(text: str, operations: list, args: dict) -> str:
     - text (str): The input text.
     - operations (list): An ordered list of operations to run on the text.
     - args (dict): A dictionary mapping operations to their arguments.
+    - use_cache (bool): Whether to serve and store the result through the result cache. Defaults to False.
 
     Returns:
     - str: The processed text after all operations have been applied.
-    """
-    result = text
-    
-    for operation in operations:
-        operation_found = False
-        for _, module in utils.items():
-            if hasattr(module, operation):
-                operation_func = getattr(module, operation)
-                operation_args = args.get(operation, {})
-                result = operation_func(result, **operation_args)
-                operation_found = True
-                break
-        if not operation_found:
-            return {"error": f"Invalid operation specified: {operation}"}, 400
 
-    return result
+    Raises:
+    ValueError: If an operation does not exist or its arguments are invalid.
+    """
+    return _execute(_canonical_spec(operations, args), text, use_cache)
 
 
-def default_pipeline(text: str) -> str:
+def default_pipeline(text: str, use_cache: bool = False) -> str:
     """
     This method applies a preset ordered series of text processing operations to the input text.
 
     Parameters:
     - text (str): This input text.
+    - use_cache (bool): Whether to serve and store the result through the result cache. Defaults to False.
 
     Returns:
     - str: The processed text after all operations have been applied.
     """
-    default_operations = [
-        "expand_contractions",
-        "change_case",
-        "handle_line_feeds",
-        "remove_whitespace",
-        "remove_special_characters",
-        "remove_punctuation",
-    ]
-
-    default_args = {
-        "change_case": {
-            "case": "lower"
-            }
-    }
+    return _execute(_canonical_spec(DEFAULT_OPERATIONS, DEFAULT_ARGS), text, use_cache)
+
+
+def profile_pipeline(text: str, operations: Optional[list] = None, args: Optional[dict] = None) -> Tuple[Any, List[dict]]:
+    """
+    This method runs a pipeline while measuring every stage, bypassing the result cache. Fused operations are measured
+    as one stage. Lengths are in characters for text and in tokens for token streams. Profiled runs are serialized, as
+    allocations are traced process-wide: peak memory includes allocations made meanwhile by other threads, and requests
+    running concurrently pay the tracing overhead.
+
+    Parameters:
+    - text (str): The input text.
+    - operations (Optional[list]): An ordered list of operations to run on the text. If None, the default pipeline is used.
+    - args (Optional[dict]): A dictionary mapping operations to their arguments. Defaults to None.
+
+    Returns:
+    - Tuple[Any, List[dict]]: The processed text and, per stage, its wall time, CPU time, input and output length and peak traced allocation.
+
+    Raises:
+    ValueError: If an operation does not exist or its arguments are invalid.
+    """
+    if operations is None:
+        operations, args = DEFAULT_OPERATIONS, DEFAULT_ARGS
+
+    profile = []
+    result = _run_plan(compile_pipeline(operations, args), text, profile)
+
+    return result, profile
+
+
+def result_cache_stats() -> dict:
+    """
+    This method returns the size and hit, miss and eviction counters of the pipeline result cache, with those of the
+    per-paragraph cache used by incremental processing under "paragraphs".
+
+    Returns:
+    - dict: The result cache statistics.
+    """
+    return {**_result_cache.stats(), "paragraphs": _paragraph_cache.stats()}
+
+
+def clear_result_cache() -> None:
+    """
+    This method removes every entry from the pipeline result cache and the per-paragraph cache. Counters are kept.
+    """
+    _result_cache.clear()
+    _paragraph_cache.clear()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """
+    Lazily creates the process pool shared by all batch requests. Workers are spawned rather than forked because the
+    web server is multi-threaded.
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=BATCH_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _executor
+
+
+def _reset_executor() -> None:
+    global _executor
+
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = None
+
+
+def _process_chunk(spec: str, texts: List[Any]) -> List[dict]:
+    """
+    Runs one compiled pipeline over a chunk of documents, capturing errors per document.
+    """
+    plan = _compile_spec(spec)
+    results = []
+
+    for text in texts:
+        if not isinstance(text, str) or not text:
+            results.append({"error": "No text provided."})
+            continue
+        try:
+            results.append({"result": _run_plan(plan, text)})
+        except Exception as e:
+            results.append({"error": str(e)})
+
+    return results
 
-    result = text
 
-    for operation in default_operations:
-        operation_found = False
-        for _, module in utils.items():
-            if hasattr(module, operation):
-                operation_func = getattr(module, operation)
-                operation_args = default_args.get(operation, {})
-                result = operation_func(result, **operation_args)
-                operation_found = True
-                break
-        if not operation_found:
-            return {"error": f"Invalid operation specified: {operation}"}, 400
-        
-    return result
\ No newline at end of file
+def batch_pipeline(texts: List[str], operations: Optional[list] = None, args: Optional[dict] = None, use_cache: bool = False) -> List[dict]:
+    """
+    This method applies one pipeline to a batch of documents, spreading large batches across a pool of worker processes.
+
+    Parameters:
+    - texts (List[str]): The input documents.
+    - operations (Optional[list]): An ordered list of operations to run on each document. If None, the default pipeline is used.
+    - args (Optional[dict]): A dictionary mapping operations to their arguments. Defaults to None.
+    - use_cache (bool): Whether to serve and store results through the result cache. Only documents that miss the cache are processed. Defaults to False.
+
+    Returns:
+    - List[dict]: One entry per document, in input order, holding either a "result" or an "error".
+
+    Raises:
+    ValueError: If the batch is too large or the pipeline is invalid.
+    """
+    if not isinstance(texts, list):
+        raise ValueError("Texts must be a list of strings.")
+
+    if len(texts) > BATCH_MAX_SIZE:
+        raise ValueError(f"Batch too large: {len(texts)} documents. The maximum is {BATCH_MAX_SIZE}.")
+
+    if operations is None:
+        operations, args = DEFAULT_OPERATIONS, DEFAULT_ARGS
+
+    spec = _canonical_spec(operations, args)
+    _compile_spec(spec)
+
+    if not use_cache:
+        return _process_texts(spec, texts)
+
+    results = [None] * len(texts)
+    keys = {}
+    for index, text in enumerate(texts):
+        if isinstance(text, str) and text:
+            key = _result_cache.key(spec, text)
+            found, result = _result_cache.get(key)
+            if found:
+                results[index] = {"result": result}
+                continue
+            keys[index] = key
+
+    pending = [index for index, result in enumerate(results) if result is None]
+    for index, result in zip(pending, _process_texts(spec, [texts[index] for index in pending])):
+        results[index] = result
+        if index in keys and "result" in result:
+            _result_cache.put(keys[index], result["result"])
+
+    return results
+
+
+def _process_texts(spec: str, texts: List[Any]) -> List[dict]:
+    """
+    Processes documents inline, or across the process pool when there are enough of them to amortize the overhead.
+    """
+    if BATCH_WORKERS == 1 or len(texts) < BATCH_POOL_THRESHOLD:
+        return _process_chunk(spec, texts)
+
+    chunk_size = -(-len(texts) // (BATCH_WORKERS * 4))
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+
+    try:
+        chunk_results = _get_executor().map(_process_chunk, itertools.repeat(spec), chunks)
+        return [result for chunk in chunk_results for result in chunk]
+    except BrokenProcessPool:
+        logger.exception("The batch process pool terminated unexpectedly.")
+        _reset_executor()
+        raise
+
+
+def _process_record(line: bytes) -> dict:
+    record = json.loads(line)
+    if not isinstance(record, dict):
+        raise ValueError("Each record must be a JSON object.")
+
+    output = {"id": record["id"]} if "id" in record else {}
+    text = record.get("text")
+    operations = record.get("operations")
+
+    try:
+        if not isinstance(text, str) or not text:
+            raise ValueError("No text provided.")
+        if operations:
+            spec = _canonical_spec(operations, record.get("args"))
+        else:
+            spec = _canonical_spec(DEFAULT_OPERATIONS, DEFAULT_ARGS)
+        output["result"] = _execute(spec, text, record.get("cache") is True)
+    except Exception as e:
+        output["error"] = str(e)
+
+    return output
+
+
+def stream_pipeline(stream: BinaryIO) -> Iterator[str]:
+    """
+    This method applies a pipeline to each record of a newline-delimited JSON (NDJSON) stream as it is read. Each record
+    is an object with a "text" and, optionally, "operations", "args", a "cache" flag and an "id" that is echoed back.
+    Records without operations run through the default pipeline. Only one record is held in memory at a time.
+
+    Parameters:
+    - stream (BinaryIO): A binary stream of NDJSON records.
+
+    Returns:
+    - Iterator[str]: One NDJSON line per record, in input order, holding either a "result" or an "error".
+    """
+    line_number = 0
+
+    while True:
+        line = stream.readline(STREAM_MAX_RECORD_SIZE + 1)
+        if not line:
+            break
+        line_number += 1
+
+        if len(line) > STREAM_MAX_RECORD_SIZE:
+            while line and not line.endswith(b"\n"):
+                line = stream.readline(STREAM_MAX_RECORD_SIZE)
+            output = {"error": f"Record on line {line_number} exceeds {STREAM_MAX_RECORD_SIZE} bytes."}
+        elif not line.strip():
+            continue
+        else:
+            try:
+                output = _process_record(line)
+            except ValueError as e:
+                output = {"error": f"Invalid record on line {line_number}: {str(e)}"}
+
+        try:
+            serialized = json.dumps(output)
+        except (TypeError, ValueError) as e:
+            error = {"id": output["id"]} if "id" in output else {}
+            error["error"] = f"Result on line {line_number} could not be serialized: {str(e)}"
+            serialized = json.dumps(error)
+
+        yield serialized + "\n"
+
+
+class _Job:
+    """
+    A pipeline run submitted to the process pool, tracked until its result expires.
+    """
+    def __init__(self, future: Future):
+        self.future = future
+        self.finished_at = None
+        future.add_done_callback(self._finish)
+
+    def _finish(self, _: Future) -> None:
+        self.finished_at = time.monotonic()
+
+    def expired(self, now: float) -> bool:
+        return self.finished_at is not None and self.finished_at + JOB_RESULT_TTL < now
+
+
+def _run_spec(spec: str, text: str) -> Any:
+    return _run_plan(_compile_spec(spec), text)
+
+
+def _purge_jobs() -> None:
+    now = time.monotonic()
+    for job_id in [job_id for job_id, job in _jobs.items() if job.expired(now)]:
+        del _jobs[job_id]
+
+
+def submit_job(text: str, operations: Optional[list] = None, args: Optional[dict] = None) -> str:
+    """
+    This method submits a pipeline run to the local process pool and returns immediately, so long documents do not
+    occupy a request thread. Finished results are kept for JOB_RESULT_TTL seconds.
+
+    Parameters:
+    - text (str): The input text.
+    - operations (Optional[list]): An ordered list of operations to run on the text. If None, the default pipeline is used.
+    - args (Optional[dict]): A dictionary mapping operations to their arguments. Defaults to None.
+
+    Returns:
+    - str: The job id.
+
+    Raises:
+    ValueError: If the pipeline is invalid.
+    RuntimeError: If too many jobs are already tracked.
+    """
+    if operations is None:
+        operations, args = DEFAULT_OPERATIONS, DEFAULT_ARGS
+
+    spec = _canonical_spec(operations, args)
+    _compile_spec(spec)
+
+    with _jobs_lock:
+        _purge_jobs()
+        if len(_jobs) >= JOB_MAX_JOBS:
+            raise RuntimeError("Too many jobs in progress. Try again later.")
+
+        try:
+            future = _get_executor().submit(_run_spec, spec, text)
+        except BrokenProcessPool:
+            logger.exception("The process pool terminated unexpectedly. Starting a new one.")
+            _reset_executor()
+            future = _get_executor().submit(_run_spec, spec, text)
+
+        job_id = uuid.uuid4().hex
+        _jobs[job_id] = _Job(future)
+
+    return job_id
+
+
+def job_status(job_id: str) -> Optional[dict]:
+    """
+    This method reports the status of a submitted job and, once it has finished, its result or error.
+
+    Parameters:
+    - job_id (str): The job id returned on submission.
+
+    Returns:
+    - Optional[dict]: The job id, its status ('pending', 'running', 'completed' or 'failed') and its result or error. None if the job is unknown or has expired.
+    """
+    with _jobs_lock:
+        _purge_jobs()
+        job = _jobs.get(job_id)
+
+    if job is None:
+        return None
+
+    status = {"job_id": job_id}
+
+    if not job.future.done():
+        status["status"] = "running" if job.future.running() else "pending"
+    elif job.future.cancelled():
+        status.update(status="failed", error="The job was cancelled.")
+    elif job.future.exception() is not None:
+        status.update(status="failed", error=str(job.future.exception()))
+    else:
+        status.update(status="completed", result=job.future.result())
+
+    return status
+
+
+def _is_line_local(operation: str, operation_args: dict) -> bool:
+    is_line_local = _LINE_LOCAL_OPERATIONS.get(operation)
+    try:
+        return is_line_local is not None and is_line_local(**operation_args)
+    except TypeError:
+        return False
+
+
+def _joins_lines(operation: str, operation_args: dict) -> bool:
+    return operation == "handle_line_feeds" and operation_args.get("mode", "remove") == "remove"
+
+
+def _line_local_prefix(operations: List[str], args: dict) -> int:
+    """
+    Returns how many leading operations can be applied line by line together. Removing line feeds is line-local on
+    its own, but an operation after it sees the joined lines, so it ends the prefix unless it is the last operation.
+    """
+    for index, operation in enumerate(operations):
+        operation_args = args.get(operation, {})
+        if not _is_line_local(operation, operation_args):
+            return index
+        if _joins_lines(operation, operation_args) and index + 1 < len(operations):
+            return index
+    return len(operations)
+
+
+def check_line_local(operations: List[str], args: Optional[dict] = None) -> None:
+    """
+    This method checks that every operation of a pipeline, with its arguments, can be applied line by line, as
+    process_file requires.
+
+    Parameters:
+    - operations (List[str]): An ordered list of operations to run on the text.
+    - args (Optional[dict]): A dictionary mapping operations to their arguments. Defaults to None.
+
+    Raises:
+    ValueError: If an operation is not local to a line, or follows an operation that joins lines.
+    """
+    args = args or {}
+    prefix = _line_local_prefix(operations, args)
+
+    if prefix < len(operations):
+        operation = operations[prefix]
+        if _joins_lines(operation, args.get(operation, {})):
+            raise ValueError(
+                f"Operation '{operation}' joins lines, so it must be the last operation of a pipeline applied line "
+                f"by line.")
+        raise ValueError(
+            f"Operation '{operation}' with these arguments cannot be applied line by line. "
+            f"Supported operations are: {', '.join(sorted(_LINE_LOCAL_OPERATIONS))}.")
+
+
+def process_file(source: str, destination: str, operations: Optional[list] = None, args: Optional[dict] = None,
+                 chunk_size: int = FILE_CHUNK_SIZE) -> dict:
+    """
+    This method applies a pipeline to a UTF-8 file of any size. The input is memory-mapped and processed in chunks that
+    end on line boundaries, and each processed chunk is written out before the next is read, so memory use depends on
+    the chunk size rather than the file size. The output is written to a temporary file that replaces the destination
+    once complete. Only operations that are local to a line are supported.
+
+    Parameters:
+    - source (str): The path of the input file.
+    - destination (str): The path of the output file. It may be the input file itself.
+    - operations (Optional[list]): An ordered list of operations to run on the text. If None, the line-local operations of the default pipeline are used.
+    - args (Optional[dict]): A dictionary mapping operations to their arguments. Defaults to None.
+    - chunk_size (int): The target chunk size in bytes. A single line longer than this is read as one chunk. Defaults to FILE_CHUNK_SIZE.
+
+    Returns:
+    - dict: The number of bytes read and written and the number of chunks processed.
+
+    Raises:
+    ValueError: If the pipeline is invalid or contains operations that are not local to a line.
+    """
+    if operations is None:
+        operations = [operation for operation in DEFAULT_OPERATIONS if operation in _LINE_LOCAL_OPERATIONS]
+        args = DEFAULT_ARGS
+
+    plan = compile_pipeline(operations, args)
+    check_line_local(operations, args)
+    stats = {"bytes_read": 0, "bytes_written": 0, "chunks": 0}
+
+    # The output goes to a temporary file next to the destination, which replaces it once complete, so the input is
+    # never truncated before it is read, even when the destination is the source itself.
+    descriptor, temporary_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(destination)), suffix=".tmp")
+    try:
+        with open(source, "rb") as source_file, open(descriptor, "w", encoding="utf-8", newline="") as destination_file:
+            size = os.fstat(source_file.fileno()).st_size
+            if size:
+                with mmap.mmap(source_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    start = 0
+                    while start < size:
+                        end = min(start + chunk_size, size)
+                        if end < size:
+                            newline = mapped.rfind(b"\n", start, end)
+                            if newline == -1:
+                                newline = mapped.find(b"\n", end)
+                            end = size if newline == -1 else newline + 1
+
+                        result = _run_plan(plan, mapped[start:end].decode("utf-8"))
+                        destination_file.write(result)
+
+                        stats["bytes_read"] += end - start
+                        stats["bytes_written"] += len(result.encode("utf-8"))
+                        stats["chunks"] += 1
+                        start = end
+
+        shutil.copymode(source, temporary_path)
+        os.replace(temporary_path, destination)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+    return stats
+
+
+def _registry_path(pipeline_id: str) -> str:
+    return os.path.join(PIPELINE_REGISTRY_DIR, f"{pipeline_id}.json")
+
+
+def _load_registry() -> None:
+    """
+    Precompiles every persisted pipeline the first time the registry is used in this process.
+    """
+    global _registry_loaded
+
+    if _registry_loaded:
+        return
+    _registry_loaded = True
+
+    if not os.path.isdir(PIPELINE_REGISTRY_DIR):
+        return
+
+    for name in os.listdir(PIPELINE_REGISTRY_DIR):
+        pipeline_id, extension = os.path.splitext(name)
+        if extension == ".json" and _PIPELINE_ID_RE.match(pipeline_id):
+            try:
+                _load_pipeline(pipeline_id)
+            except (OSError, ValueError):
+                logger.exception(f"Could not load registered pipeline {pipeline_id}.")
+
+
+def _load_pipeline(pipeline_id: str) -> Optional[Tuple[str, Tuple[_Stage, ...]]]:
+    path = _registry_path(pipeline_id)
+    if not os.path.isfile(path):
+        return None
+
+    with open(path, encoding="utf-8") as f:
+        spec = f.read()
+
+    entry = (spec, _compile_spec(spec))
+    _registry[pipeline_id] = entry
+    return entry
+
+
+def _registered(pipeline_id: str) -> Optional[Tuple[str, Tuple[_Stage, ...]]]:
+    if not isinstance(pipeline_id, str) or not _PIPELINE_ID_RE.match(pipeline_id):
+        return None
+
+    with _registry_lock:
+        _load_registry()
+        if not os.path.isfile(_registry_path(pipeline_id)):
+            # The pipeline may have been deleted by another process.
+            _registry.pop(pipeline_id, None)
+            return None
+        entry = _registry.get(pipeline_id)
+        if entry is None:
+            entry = _load_pipeline(pipeline_id)
+
+    return entry
+
+
+def _registered_ids() -> List[str]:
+    if not os.path.isdir(PIPELINE_REGISTRY_DIR):
+        return []
+
+    return [pipeline_id for pipeline_id, extension in map(os.path.splitext, os.listdir(PIPELINE_REGISTRY_DIR))
+            if extension == ".json" and _PIPELINE_ID_RE.match(pipeline_id)]
+
+
+def register_pipeline(operations: List[str], args: Optional[dict] = None) -> str:
+    """
+    This method validates and precompiles a pipeline and registers it under an id derived from its canonical spec,
+    so clients can invoke it by id instead of resending its operations and arguments. Registered plans are pinned in
+    memory until they are deleted, and are persisted to PIPELINE_REGISTRY_DIR so other worker processes load and
+    precompile them too. At most PIPELINE_REGISTRY_MAX pipelines can be registered.
+
+    Parameters:
+    - operations (List[str]): An ordered list of operations to run on the text.
+    - args (Optional[dict]): A dictionary mapping operations to their arguments. Defaults to None.
+
+    Returns:
+    - str: The pipeline id. Registering the same pipeline twice returns the same id.
+
+    Raises:
+    ValueError: If an operation does not exist or its arguments are invalid.
+    RuntimeError: If the registry is full.
+    """
+    spec = _canonical_spec(operations, args)
+    plan = _compile_spec(spec)
+    pipeline_id = hashlib.blake2b(spec.encode("utf-8"), digest_size=16).hexdigest()
+
+    with _registry_lock:
+        path = _registry_path(pipeline_id)
+        if not os.path.isfile(path):
+            if len(_registered_ids()) >= PIPELINE_REGISTRY_MAX:
+                raise RuntimeError(
+                    f"Too many registered pipelines. The maximum is {PIPELINE_REGISTRY_MAX}; delete unused ones first.")
+            os.makedirs(PIPELINE_REGISTRY_DIR, mode=0o700, exist_ok=True)
+            temporary_path = f"{path}.{os.getpid()}.tmp"
+            with open(temporary_path, "w", encoding="utf-8") as f:
+                f.write(spec)
+            os.replace(temporary_path, path)
+
+        _registry[pipeline_id] = (spec, plan)
+
+    return pipeline_id
+
+
+def delete_pipeline(pipeline_id: str) -> bool:
+    """
+    This method unregisters a pipeline, removing it from memory and from PIPELINE_REGISTRY_DIR.
+
+    Parameters:
+    - pipeline_id (str): The id returned on registration.
+
+    Returns:
+    - bool: True if the pipeline was registered, False otherwise.
+    """
+    if not isinstance(pipeline_id, str) or not _PIPELINE_ID_RE.match(pipeline_id):
+        return False
+
+    with _registry_lock:
+        _registry.pop(pipeline_id, None)
+        try:
+            os.remove(_registry_path(pipeline_id))
+        except FileNotFoundError:
+            return False
+
+    return True
+
+
+def get_pipeline(pipeline_id: str) -> Optional[dict]:
+    """
+    This method returns the definition of a registered pipeline.
+
+    Parameters:
+    - pipeline_id (str): The id returned on registration.
+
+    Returns:
+    - Optional[dict]: The "operations" and "args" of the pipeline, or None if it is not registered.
+    """
+    entry = _registered(pipeline_id)
+    if entry is None:
+        return None
+
+    operations, args = json.loads(entry[0])
+    return {"operations": operations, "args": args}
+
+
+def run_registered_pipeline(text: str, pipeline_id: str, use_cache: bool = False) -> Any:
+    """
+    This method applies a registered pipeline to the input text.
+
+    Parameters:
+    - text (str): The input text.
+    - pipeline_id (str): The id returned on registration.
+    - use_cache (bool): Whether to serve and store the result through the result cache. Defaults to False.
+
+    Returns:
+    - Any: The processed text after all operations have been applied.
+
+    Raises:
+    KeyError: If the pipeline is not registered.
+    """
+    entry = _registered(pipeline_id)
+    if entry is None:
+        raise KeyError(pipeline_id)
+
+    spec, plan = entry
+    return _execute(spec, text, use_cache, plan)
+
+
+def _paragraphs(text: str) -> List[str]:
+    parts = _PARAGRAPH_SEPARATOR_RE.split(text)
+    paragraphs = [paragraph + separator for paragraph, separator in zip(parts[::2], parts[1::2])]
+    if parts[-1]:
+        paragraphs.append(parts[-1])
+    return paragraphs
+
+
+def incremental_pipeline(text: str, operations: Optional[list] = None, args: Optional[dict] = None) -> Any:
+    """
+    This method applies a pipeline paragraph by paragraph, reusing cached output for paragraphs it has already
+    processed, so re-submitting an edited document only processes the paragraphs that changed. The leading operations
+    that are local to a line run incrementally; the first operation that is not, and every one after it, run on the
+    reassembled text. Removing line feeds also ends the incremental part when another operation follows it, since
+    that operation must see the paragraphs joined. The result is identical to a full run.
+
+    Parameters:
+    - text (str): The input text.
+    - operations (Optional[list]): An ordered list of operations to run on the text. If None, the default pipeline is used.
+    - args (Optional[dict]): A dictionary mapping operations to their arguments. Defaults to None.
+
+    Returns:
+    - Any: The processed text after all operations have been applied.
+
+    Raises:
+    ValueError: If an operation does not exist or its arguments are invalid.
+    """
+    if operations is None:
+        operations, args = DEFAULT_OPERATIONS, DEFAULT_ARGS
+
+    args = args or {}
+    compile_pipeline(operations, args)
+
+    split = _line_local_prefix(operations, args)
+
+    if split == 0:
+        return _run_plan(compile_pipeline(operations, args), text)
+
+    spec = _canonical_spec(operations[:split], args)
+    plan = _compile_spec(spec)
+    pieces = []
+
+    for paragraph in _paragraphs(text):
+        key = _paragraph_cache.key(spec, paragraph)
+        found, result = _paragraph_cache.get(key)
+        if not found:
+            result = _run_plan(plan, paragraph)
+            _paragraph_cache.put(key, result)
+        pieces.append(result)
+
+    result = ''.join(pieces)
+
+    if split < len(operations):
+        result = _run_plan(compile_pipeline(operations[split:], args), result)
+
+    return result
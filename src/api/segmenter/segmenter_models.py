@@ -4,16 +4,29 @@ from flask_restx import fields, Namespace
 segmenter_ns = Namespace("segmenter", description="This service includes functions that divide text into meaningful segments or units, such as sentences, n-grams or tokens.")
 
 extract_ngrams_model = segmenter_ns.model("ExtractNgrams", {
-    "text": fields.String(required=True, description="The input text."),
+    "text": fields.Raw(required=True, description="The input text, or a list of input texts."),
     "n": fields.Integer(required=False, description="The number of grams for the n-grams. Defaults to 2."),
     "padding": fields.Boolean(required=False, description="Whether to add padding to the start and end of sentences. Defaults to False"),
-    "tokens": fields.List(fields.String, required=False, description="Custom token list. If none, the text will be split by spaces.")
+    "tokens": fields.List(fields.String, required=False, description="Custom token list. If none, the text will be split by spaces."),
+    "mode": fields.String(required=False, description="The output mode - either 'list', 'counts', 'top_k' or 'hashed'. Defaults to 'list'."),
+    "max_n": fields.Integer(required=False, description="If given, n-grams of every size from n to max_n are extracted. Defaults to None."),
+    "k": fields.Integer(required=False, description="The number of n-grams returned in 'top_k' mode. Defaults to 10.")
+})
+
+hash_shingles_model = segmenter_ns.model("HashShingles", {
+    "text": fields.Raw(required=True, description="The input text, or a list of input texts."),
+    "n": fields.Integer(required=False, description="The number of characters or words per shingle. Defaults to 5."),
+    "unit": fields.String(required=False, description="Either 'char' for character n-grams or 'word' for word shingles. Defaults to 'char'."),
+    "output": fields.String(required=False, description="The output format - either 'list' for JSON arrays of hashes, or 'binary' for the hashes as little-endian unsigned 64-bit integers, each text's preceded by their count for a list of texts. Defaults to 'list'.")
 })
 
 tokenize_sentences_model = segmenter_ns.model("TokenizeSentences", {
-    "text": fields.String(required=True, description="The input text."),
+    "text": fields.Raw(required=True, description="The input text, or a list of input texts."),
+    "output": fields.String(required=False, description="The output format - either 'text' for substrings, 'spans' for a flat array of start and end offsets, or 'binary' for those offsets as little-endian unsigned 32-bit integers. Defaults to 'text'.")
 })
 
 tokenize_words_model = segmenter_ns.model("TokenizeWords", {
-    "text": fields.String(required=True, description="The input text."),
+    "text": fields.Raw(required=True, description="The input text, or a list of input texts."),
+    "output": fields.String(required=False, description="The output format - either 'text' for substrings, 'spans' for a flat array of start and end offsets, or 'binary' for those offsets as little-endian unsigned 32-bit integers. Defaults to 'text'."),
+    "tokenizer": fields.String(required=False, description="The word tokenizer - either 'treebank' for NLTK's word_tokenize, or 'regex' for a faster single-pattern tokenizer that agrees with it on common English text. Defaults to 'treebank'.")
 })
@@ -1,7 +1,11 @@
 # Import third-party libraries
 import inspect
+import sys
+from array import array
+from flask import Response
 from flask_restx import Resource
-from typing import Dict, Any
+import numpy as np
+from typing import Any, Dict, List, Optional, Union
 
 # Import project code
 from . import segmenter_utils
@@ -11,6 +15,49 @@ from log_config import Logger
 
 logger = Logger().get_logger()
 
+OUTPUTS = ['text', 'spans', 'binary']
+SHINGLE_OUTPUTS = ['list', 'binary']
+
+
+def _pack_spans(spans: Union[array, List[array]]) -> bytes:
+    """
+    Packs span offsets as little-endian unsigned 32-bit integers. For a list of texts, the offsets of each text are
+    preceded by their count.
+    """
+    if isinstance(spans, array):
+        spans = spans[:]
+        if sys.byteorder == 'big':
+            spans.byteswap()
+        return spans.tobytes()
+    return b''.join(_pack_spans(array(segmenter_utils.SPAN_TYPECODE, [len(item)])) + _pack_spans(item) for item in spans)
+
+
+def _pack_hashes(hashes: Union[np.ndarray, List[np.ndarray]]) -> bytes:
+    """
+    Packs shingle hashes as little-endian unsigned 64-bit integers. For a list of texts, the hashes of each text are
+    preceded by their count.
+    """
+    if isinstance(hashes, np.ndarray):
+        return hashes.astype('<u8', copy=False).tobytes()
+    counts = np.array([len(item) for item in hashes], dtype=np.int64)
+    # Each count goes before the hashes of its text, after the counts and hashes of the texts before it.
+    count_positions = np.arange(len(counts)) + np.cumsum(counts) - counts
+    is_hash = np.ones(len(counts) + counts.sum(), dtype=bool)
+    is_hash[count_positions] = False
+
+    packed = np.empty(len(is_hash), dtype='<u8')
+    packed[count_positions] = counts
+    packed[is_hash] = np.concatenate(hashes) if hashes else []
+    return packed.tobytes()
+
+
+def _spans_response(spans: Union[array, List[array]], output: str):
+    if output == 'binary':
+        return Response(_pack_spans(spans), mimetype="application/octet-stream")
+    if isinstance(spans, array):
+        return {"result": spans.tolist()}, 200
+    return {"result": [item.tolist() for item in spans]}, 200
+
 @segmenter_ns.route("/ngrams")
 class ExtractNgramsResource(Resource):
     @segmenter_ns.doc(description=inspect.getdoc(segmenter_utils.extract_ngrams))
@@ -21,21 +68,60 @@ class ExtractNgramsResource(Resource):
         """
         try:
             data: Dict[str, Any] = api.payload
-            text: str = data.get("text", "")
+            text: Union[str, List[str]] = data.get("text", "")
             n: int = data.get("n", 2)
             padding: bool = data.get("padding", False)
-            tokens: list = data.get("tokens", [])
+            tokens: Optional[List[str]] = data.get("tokens", None)
+            mode: str = data.get("mode", "list")
+            max_n: Optional[int] = data.get("max_n", None)
+            k: int = data.get("k", 10)
 
             if not text:
                 return {"error": "No text provided."}, 400
             
-            result = segmenter_utils.extract_ngrams(text, n, padding, tokens)
+            result = segmenter_utils.extract_ngrams(text, n, padding, tokens, mode, max_n, k)
+            if isinstance(result, array):
+                result = result.tolist()
+            elif mode == "hashed":
+                result = [item.tolist() for item in result]
             return {"result": result}, 200
         
         except Exception as e:
             logger.exception("An error occurred during the encoding process.")
             return {"error": f"An unexpected error occurred: {str(e)}"}, 500
     
+@segmenter_ns.route("/shingles")
+class HashShinglesResource(Resource):
+    @segmenter_ns.doc(description=inspect.getdoc(segmenter_utils.hash_shingles))
+    @segmenter_ns.expect(hash_shingles_model)
+    def post(self):
+        """
+        Hashes the character n-grams or word shingles of the text.
+        """
+        try:
+            data: Dict[str, Any] = api.payload
+            text: Union[str, List[str]] = data.get("text", "")
+            n: int = data.get("n", 5)
+            unit: str = data.get("unit", "char")
+            output: str = data.get("output", "list")
+
+            if not text:
+                return {"error": "No text provided."}, 400
+
+            if output not in SHINGLE_OUTPUTS:
+                return {"error": f"Invalid output: '{output}'. Valid options are {', '.join(SHINGLE_OUTPUTS)}."}, 400
+
+            result = segmenter_utils.hash_shingles(text, n, unit)
+            if output == "binary":
+                return Response(_pack_hashes(result), mimetype="application/octet-stream")
+            if isinstance(result, np.ndarray):
+                return {"result": result.tolist()}, 200
+            return {"result": [item.tolist() for item in result]}, 200
+
+        except Exception as e:
+            logger.exception("An error occurred during the encoding process.")
+            return {"error": f"An unexpected error occurred: {str(e)}"}, 500
+
 @segmenter_ns.route("/sentences")
 class TokenizeSentencesResource(Resource):
     @segmenter_ns.doc(description=inspect.getdoc(segmenter_utils.tokenize_sentences))
@@ -46,10 +132,17 @@ class TokenizeSentencesResource(Resource):
         """
         try:
             data: Dict[str, Any] = api.payload
-            text: str = data.get("text", "")
+            text: Union[str, List[str]] = data.get("text", "")
+            output: str = data.get("output", "text")
 
             if not text:
                 return {"error": "No text provided."}, 400
+
+            if output not in OUTPUTS:
+                return {"error": f"Invalid output: '{output}'. Valid options are {', '.join(OUTPUTS)}."}, 400
+
+            if output != "text":
+                return _spans_response(segmenter_utils.sentence_spans(text), output)
             
             result = segmenter_utils.tokenize_sentences(text)
             return {"result": result}, 200
@@ -68,12 +161,20 @@ class TokenizeWordsResource(Resource):
         """
         try:
             data: Dict[str, Any] = api.payload
-            text: str = data.get("text", "")
+            text: Union[str, List[str]] = data.get("text", "")
+            output: str = data.get("output", "text")
+            tokenizer: str = data.get("tokenizer", "treebank")
 
             if not text:
                 return {"error": "No text provided."}, 400
+
+            if output not in OUTPUTS:
+                return {"error": f"Invalid output: '{output}'. Valid options are {', '.join(OUTPUTS)}."}, 400
+
+            if output != "text":
+                return _spans_response(segmenter_utils.word_spans(text, tokenizer), output)
             
-            result = segmenter_utils.tokenize_words(text)
+            result = segmenter_utils.tokenize_words(text, tokenizer)
             return {"result": result}, 200
         
         except Exception as e:
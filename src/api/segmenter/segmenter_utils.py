@@ -1,60 +1,344 @@
 # Import standard libraries
-from typing import List, Optional
+import collections
+import copy
+import functools
+import heapq
+import zlib
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 # Import third-party libraries
-from nltk import ngrams as _ngrams
+import numpy as np
+from nltk.tokenize import TreebankWordTokenizer
 from nltk.tokenize import sent_tokenize as _sent_tokenize
-from nltk.tokenize import word_tokenize as _word_tokenize
 
+try:
+    from nltk.tokenize import _get_punkt_tokenizer
+except ImportError:
+    # NLTK < 3.8.2 loads the pickled Punkt models.
+    from nltk.data import load as _load
 
-def extract_ngrams(text: str, n: int = 2, padding: bool = False, tokens: Optional[List[str]] = None) -> List[str]:
+    @functools.lru_cache(maxsize=None)
+    def _get_punkt_tokenizer(language: str = 'english'):
+        return _load(f'tokenizers/punkt/{language}.pickle')
+
+# Import project code
+from api import batch
+from api import token_stream
+
+# NLTKWordTokenizer, behind word_tokenize, cannot find spans on older NLTK releases; the Treebank tokenizer can.
+_TREEBANK_WORD_TOKENIZER = TreebankWordTokenizer()
+
+# Type code of the packed span arrays and hashed n-gram IDs: unsigned 32-bit integers.
+SPAN_TYPECODE = 'I'
+
+NGRAM_MODES = ['list', 'counts', 'top_k', 'hashed']
+
+SHINGLE_UNITS = ['char', 'word']
+
+# Multiplier of the rolling polynomial hash of character and word sequences, modulo 2**64. It is odd, so invertible.
+_HASH_BASE = 0x100000001B3
+_HASH_BASE_INVERSE = pow(_HASH_BASE, -1, 2 ** 64)
+# Whitespace as defined by str.isspace. No code point above U+3000 is whitespace.
+_WHITESPACE_LIMIT = 0x3000
+_IS_WHITESPACE = np.array([chr(codepoint).isspace() for codepoint in range(_WHITESPACE_LIMIT + 1)])
+
+# Number of counters kept by the space-saving summary per requested top-k n-gram, and at least.
+TOP_K_CAPACITY_FACTOR = 10
+TOP_K_MIN_CAPACITY = 1000
+
+
+class _SpaceSaving:
+    """
+    The space-saving summary of Metwally et al. It keeps a bounded number of counters; an unseen item takes over the
+    counter of the least frequent one and inherits its count. Counts are overestimates, and every item occurring more
+    often than the stream length divided by the capacity is guaranteed to be kept.
+    """
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.counts = {}
+        # A min-heap with one (count, item) entry per counter. Entries are only refreshed when they reach the top, so
+        # their counts may be stale, but never above the current ones.
+        self.heap = []
+
+    def add(self, item) -> None:
+        counts = self.counts
+        if item in counts:
+            counts[item] += 1
+            return
+
+        if len(counts) < self.capacity:
+            counts[item] = 1
+            heapq.heappush(self.heap, (1, item))
+            return
+
+        count, evicted = self.heap[0]
+        while counts[evicted] != count:
+            heapq.heapreplace(self.heap, (counts[evicted], evicted))
+            count, evicted = self.heap[0]
+        del counts[evicted]
+        counts[item] = count + 1
+        heapq.heapreplace(self.heap, (count + 1, item))
+
+    def top(self, k: int) -> List[Tuple[tuple, int]]:
+        return heapq.nlargest(k, self.counts.items(), key=lambda item: item[1])
+
+
+def _ngram_tuples(tokens: List[str], n: int, max_n: int, padding: bool) -> Iterator[tuple]:
+    for size in range(n, max_n + 1):
+        sequence = ['<s>']*(size-1) + tokens + ['</s>']*(size-1) if padding else tokens
+        yield from zip(*[sequence[i:] for i in range(size)])
+
+
+def extract_ngrams(text: Union[str, List[str]], n: int = 2, padding: bool = False, tokens: Optional[List[str]] = None,
+                   mode: str = 'list', max_n: Optional[int] = None, k: int = 10) -> Union[List[str], Dict[str, int], List[Tuple[str, int]], array, list]:
     """
-    Extracts n-grams from the text.
+    Extracts n-grams from the text. Besides listing them, n-grams can be aggregated without building a string per
+    occurrence: counted exactly, reduced to the approximate k most frequent ones in memory bounded by k, or hashed to
+    32-bit IDs.
 
     Parameters:
-    - text (str): The input text.
+    - text (Union[str, List[str]]): The input text, or a list of texts.
     - n (int): The number of grams for the n-grams. Defaults to 2.
     - padding (bool): Whether to add padding to the start and end of sentences. Defaults to False.
-    - tokens (list, optional): Custom token list. If None, the text will be split by spaces.
+    - tokens (list, optional): Custom token list. If None, the text will be split by spaces. Only supported for a single text.
+    - mode (str): The output mode - either 'list', 'counts', 'top_k', or 'hashed'. Defaults to 'list'.
+    - max_n (Optional[int]): If given, n-grams of every size from n to max_n are extracted, smallest first. Defaults to None.
+    - k (int): The number of n-grams returned in 'top_k' mode. Defaults to 10.
 
     Returns:
-    - List[str]: The list of n-grams from the text.
+    - Union[List[str], Dict[str, int], List[Tuple[str, int]], array, list]: Depending on the mode, the list of n-grams, a mapping of n-grams to their counts, the k most frequent n-grams with their estimated counts, or an array('I') of the CRC-32 of each n-gram. For a list of texts, one such result per text.
     """
     if not isinstance(n, int) or n < 1:
         raise ValueError(
             "Invalid n: '{n}'. It should be an integer greater than 0.")
 
-    if tokens is None:
-        tokens = text.split()
+    if max_n is None:
+        max_n = n
+    elif not isinstance(max_n, int) or max_n < n:
+        raise ValueError(
+            f"Invalid max_n: '{max_n}'. It should be an integer no less than n.")
 
-    if padding:
-        tokens = ['<s>']*(n-1) + tokens + ['</s>']*(n-1)
+    if mode not in NGRAM_MODES:
+        raise ValueError(
+            f"Invalid mode: '{mode}'. Valid options are {', '.join(NGRAM_MODES)}.")
 
-    n_grams = _ngrams(tokens, n)
-    return [' '.join(grams) for grams in n_grams]
+    if mode == 'top_k' and (not isinstance(k, int) or k < 1):
+        raise ValueError(
+            f"Invalid k: '{k}'. It should be an integer greater than 0.")
 
+    if tokens is not None and batch.is_batch(text):
+        raise ValueError("Custom tokens are only supported for a single text.")
 
-def tokenize_sentences(text: str) -> List[str]:
+    def process(s: str, tokens: Optional[List[str]] = None):
+        if tokens is None:
+            tokens = s.split()
+
+        n_grams = _ngram_tuples(tokens, n, max_n, padding)
+
+        if mode == 'counts':
+            return {' '.join(grams): count for grams, count in collections.Counter(n_grams).items()}
+        if mode == 'top_k':
+            summary = _SpaceSaving(max(k * TOP_K_CAPACITY_FACTOR, TOP_K_MIN_CAPACITY))
+            for grams in n_grams:
+                summary.add(grams)
+            return [(' '.join(grams), count) for grams, count in summary.top(k)]
+        if mode == 'hashed':
+            return array(SPAN_TYPECODE, [zlib.crc32(' '.join(grams).encode('utf-8')) for grams in n_grams])
+        return [' '.join(grams) for grams in n_grams]
+
+    if batch.is_batch(text):
+        return [copy.copy(result) for result in batch.map_unique(process, text)]
+    return process(text, tokens)
+
+
+def tokenize_sentences(text: Union[str, List[str]]) -> Union[List[str], List[List[str]]]:
     """
     Tokenize the input text into sentences.
 
     Parameters:
-    - text (str): The input text to be tokenized.
+    - text (Union[str, List[str]]): The input text to be tokenized, or a list of texts.
 
     Returns:
-    - List[str]: The tokenized text.
+    - Union[List[str], List[List[str]]]: The tokenized text, or one list of sentences per text.
     """
+    if batch.is_batch(text):
+        return [list(sentences) for sentences in batch.map_unique(_sent_tokenize, text)]
     return _sent_tokenize(text)
 
 
-def tokenize_words(text: str) -> List[str]:
+def tokenize_words(text: Union[str, List[str]], tokenizer: str = 'treebank') -> Union[List[str], List[List[str]]]:
     """
     Tokenize the input text into words.
 
     Parameters:
-    - text (str): The input text to be tokenized.
+    - text (Union[str, List[str]]): The input text to be tokenized, or a list of texts.
+    - tokenizer (str): The word tokenizer to use. Options are 'treebank' and 'regex'. Default is 'treebank'.
+
+    Returns:
+    - Union[List[str], List[List[str]]]: The tokenized text, or one list of words per text.
+    """
+    tokenize = functools.partial(token_stream.word_tokenize, tokenizer=tokenizer)
+    if batch.is_batch(text):
+        return [list(words) for words in batch.map_unique(tokenize, text)]
+    return tokenize(text)
+
+
+def _sentence_spans(text: str) -> array:
+    spans = array(SPAN_TYPECODE)
+    for start, end in _get_punkt_tokenizer().span_tokenize(text):
+        spans.append(start)
+        spans.append(end)
+    return spans
+
+
+def _word_spans(text: str) -> array:
+    spans = array(SPAN_TYPECODE)
+    for sentence_start, sentence_end in _get_punkt_tokenizer().span_tokenize(text):
+        for start, end in _TREEBANK_WORD_TOKENIZER.span_tokenize(text[sentence_start:sentence_end]):
+            spans.append(sentence_start + start)
+            spans.append(sentence_start + end)
+    return spans
+
+
+def _regex_word_spans(text: str) -> array:
+    spans = array(SPAN_TYPECODE)
+    for start, end in token_stream.regex_word_spans(text):
+        spans.append(start)
+        spans.append(end)
+    return spans
+
+
+def sentence_spans(text: Union[str, List[str]]) -> Union[array, List[array]]:
+    """
+    Finds the sentences of the input text as character offsets instead of copied substrings. The sentences are the
+    same as those of tokenize_sentences.
+
+    Parameters:
+    - text (Union[str, List[str]]): The input text, or a list of texts.
+
+    Returns:
+    - Union[array, List[array]]: A flat array of unsigned 32-bit offsets, start and end of each sentence in turn, or one such array per text.
+    """
+    if batch.is_batch(text):
+        return [array(SPAN_TYPECODE, spans) for spans in batch.map_unique(_sentence_spans, text)]
+    return _sentence_spans(text)
+
+
+def word_spans(text: Union[str, List[str]], tokenizer: str = 'treebank') -> Union[array, List[array]]:
+    """
+    Finds the words of the input text as character offsets instead of copied substrings. With the 'treebank'
+    tokenizer, sentences are split as in tokenize_words and then the Treebank word tokenizer finds the words, which
+    may differ from tokenize_words on rare contractions and punctuation. Quotes keep their original characters.
+
+    Parameters:
+    - text (Union[str, List[str]]): The input text, or a list of texts.
+    - tokenizer (str): The word tokenizer to use. Options are 'treebank' and 'regex'. Default is 'treebank'.
 
     Returns:
-    - List[str]: The tokenized text.
+    - Union[array, List[array]]: A flat array of unsigned 32-bit offsets, start and end of each word in turn, or one such array per text.
+    """
+    if tokenizer not in token_stream.TOKENIZERS:
+        raise ValueError(
+            f"Unsupported tokenizer '{tokenizer}'. Supported tokenizers are: {', '.join(token_stream.TOKENIZERS)}")
+
+    find_spans = _regex_word_spans if tokenizer == 'regex' else _word_spans
+    if batch.is_batch(text):
+        return [array(SPAN_TYPECODE, spans) for spans in batch.map_unique(find_spans, text)]
+    return find_spans(text)
+
+
+def _codepoints(texts: List[str]) -> np.ndarray:
+    return np.frombuffer(''.join(texts).encode('utf-32-le', 'surrogatepass'), dtype='<u4').astype(np.uint64)
+
+
+def _powers(base: int, count: int) -> np.ndarray:
+    powers = np.full(count, base, dtype=np.uint64)
+    powers[:1] = 1
+    return np.cumprod(powers, dtype=np.uint64)
+
+
+def _window_hashes(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    Hashes the windows values[start:end] at once. With prefix sums of value * base**i, a window is the difference of
+    two prefix sums scaled by base**-start, so its cost does not depend on its length. Arithmetic wraps modulo 2**64.
     """
-    return _word_tokenize(text)
+    with np.errstate(over='ignore'):
+        prefix = np.zeros(len(values) + 1, dtype=np.uint64)
+        np.cumsum(values * _powers(_HASH_BASE, len(values)), dtype=np.uint64, out=prefix[1:])
+        hashes = (prefix[ends] - prefix[starts]) * _powers(_HASH_BASE_INVERSE, len(values) + 1)[starts]
+
+        # The splitmix64 finalizer spreads the bits, so that any slice of a hash can serve as a bucket.
+        hashes ^= hashes >> np.uint64(30)
+        hashes *= np.uint64(0xBF58476D1CE4E5B9)
+        hashes ^= hashes >> np.uint64(27)
+        hashes *= np.uint64(0x94D049BB133111EB)
+        hashes ^= hashes >> np.uint64(31)
+    return hashes
+
+
+def _valid_windows(starts: np.ndarray, groups: np.ndarray, n: int) -> np.ndarray:
+    """
+    Returns the positions of the windows of n items that start at each item and do not run past the end of its group.
+    """
+    candidates = np.arange(max(len(starts) - n + 1, 0))
+    return candidates[groups[candidates] == groups[candidates + n - 1]]
+
+
+def _split(hashes: np.ndarray, groups: np.ndarray, count: int) -> List[np.ndarray]:
+    bounds = np.searchsorted(groups, np.arange(count + 1)).tolist()
+    return [hashes[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def _char_shingles(texts: List[str], n: int) -> List[np.ndarray]:
+    codepoints = _codepoints(texts)
+    groups = np.repeat(np.arange(len(texts)), [len(text) for text in texts])
+    starts = _valid_windows(codepoints, groups, n)
+    return _split(_window_hashes(codepoints, starts, starts + n), groups[starts], len(texts))
+
+
+def _word_shingles(texts: List[str], n: int) -> List[np.ndarray]:
+    # Texts are joined by a space, so that no word runs from one text into the next.
+    codepoints = _codepoints([text + ' ' for text in texts])
+    lengths = np.array([len(text) + 1 for text in texts], dtype=np.int64)
+    is_space = _IS_WHITESPACE[np.minimum(codepoints, _WHITESPACE_LIMIT)] & (codepoints <= _WHITESPACE_LIMIT)
+
+    # Words are the maximal runs of non-whitespace, as with str.split.
+    edges = np.diff(np.concatenate(([True], is_space, [True])).astype(np.int8))
+    word_starts = np.flatnonzero(edges == -1)
+    word_ends = np.flatnonzero(edges == 1)
+
+    word_hashes = _window_hashes(codepoints, word_starts, word_ends)
+    groups = np.searchsorted(np.cumsum(lengths), word_starts, side='right')
+    starts = _valid_windows(word_hashes, groups, n)
+    return _split(_window_hashes(word_hashes, starts, starts + n), groups[starts], len(texts))
+
+
+def hash_shingles(text: Union[str, List[str]], n: int = 5, unit: str = 'char') -> Union[np.ndarray, List[np.ndarray]]:
+    """
+    Hashes the overlapping character n-grams or word shingles of the text to 64-bit integers, for fuzzy matching such
+    as MinHash or Jaccard similarity. The text is converted to an array of code points and every n-gram is hashed at
+    once with a rolling polynomial hash, so no n-gram string is built. A list of texts is hashed in a single pass.
+
+    Parameters:
+    - text (Union[str, List[str]]): The input text, or a list of texts.
+    - n (int): The number of characters or words per shingle. Defaults to 5.
+    - unit (str): Either 'char' for character n-grams or 'word' for shingles of whitespace-separated words. Defaults to 'char'.
+
+    Returns:
+    - Union[np.ndarray, List[np.ndarray]]: A uint64 array with the hash of each shingle in order, or one such array per text. A text shorter than n has none.
+    """
+    if not isinstance(n, int) or n < 1:
+        raise ValueError(
+            f"Invalid n: '{n}'. It should be an integer greater than 0.")
+
+    if unit not in SHINGLE_UNITS:
+        raise ValueError(
+            f"Invalid unit: '{unit}'. Valid options are {', '.join(SHINGLE_UNITS)}.")
+
+    texts = text if batch.is_batch(text) else [text]
+    if not texts:
+        return []
+
+    hashes = _char_shingles(texts, n) if unit == 'char' else _word_shingles(texts, n)
+    return hashes if batch.is_batch(text) else hashes[0]
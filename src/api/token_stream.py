@@ -0,0 +1,171 @@
+# Import standard libraries
+import collections
+import re
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+# Import third-party libraries
+from nltk.tokenize import word_tokenize as _word_tokenize
+
+TOKENIZERS = ['treebank', 'regex']
+
+# Characters that the Treebank tokenizer always splits off as tokens of their own.
+_SPLIT = r',;:@#$%&?!*()\[\]{}<>«»“”‘’„"‒-―'
+# The end of a word: whitespace, a split character, a period, an apostrophe or the end of the text.
+_END = r"(?=[\s" + _SPLIT + r".']|$)"
+# The start of a token: the start of the text, whitespace or a split character.
+_START = r"(?<![^\s" + _SPLIT + r"])"
+_CLITIC = r"(?:[sSmMdD]|ll|LL|re|RE|ve|VE)"
+_CHAR = r"[^\s" + _SPLIT + r".'`nN-]"
+# A word continues through letters, single hyphens, inner periods, digit group separators and apostrophes that do not
+# start a clitic; 'n' and 'N' stop before n't.
+_WORD = (r"(?:" + _CHAR + r"|[nN]|-(?!-))(?:" + _CHAR +
+         r"|n(?!'t" + _END + r")|N(?!'T" + _END + r")"
+         r"|-(?!-)"
+         r"|[.](?=" + _CHAR + r"|[nN-])"
+         r"|[,:](?=\d)"
+         r"|'(?!" + _CLITIC + _END + r")(?=" + _CHAR + r"|[nN-]))*")
+_ABBREVIATIONS = (r"(?:Mr|Mrs|Ms|Dr|Prof|Sr|Jr|St|vs|etc|Inc|Ltd|Co|Corp|Jan|Feb|Mar|Apr|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec|"
+                  r"No|Vol|Fig|approx|e\.g|i\.e)")
+# A period is only split off a word at the end of the text, or before what looks like the start of a new sentence.
+_NOT_FINAL = r"(?![\]\)}>\"'»”’]*\s*$)"
+_WORD_TOKEN_RE = re.compile(
+    _START + _ABBREVIATIONS + r"\." + _NOT_FINAL +
+    r"|(?:[A-Za-z]\.){2,}" + _NOT_FINAL +
+    r"|" + _START + r"[A-Z]\.(?=\s+[A-Z])" +
+    r"|" + _START + r"(?i:can(?=not\b)|gim(?=me\b)|gon(?=na\b)|got(?=ta\b)|lem(?=me\b)|wan(?=na\b))" +
+    r"|" + _WORD + r"(?:\.(?=\s+[a-z0-9]))?" +
+    r"|n't|N'T" +
+    r"|'" + _CLITIC + _END +
+    r"|\.{2,}|--|`+|''|[" + _SPLIT + r".']"
+)
+_OPEN_QUOTE_RE = re.compile(r'(^|[\s(\[{<])"')
+
+
+def _regex_tokenize(text: str) -> List[str]:
+    if '"' in text:
+        text = _OPEN_QUOTE_RE.sub(r'\1 `` ', text).replace('"', " '' ")
+    return _WORD_TOKEN_RE.findall(text)
+
+
+def regex_word_spans(text: str) -> Iterator[Tuple[int, int]]:
+    """
+    Finds the words of the 'regex' tokenizer as character offsets. Quotes keep their original characters.
+
+    Parameters:
+    - text (str): The input text.
+
+    Returns:
+    - Iterator[Tuple[int, int]]: The start and end offsets of each word.
+    """
+    return (match.span() for match in _WORD_TOKEN_RE.finditer(text))
+
+
+def _tokenizer(tokenizer: str):
+    if tokenizer == 'treebank':
+        return _word_tokenize
+    if tokenizer == 'regex':
+        return _regex_tokenize
+    raise ValueError(f"Unsupported tokenizer '{tokenizer}'. Supported tokenizers are: {', '.join(TOKENIZERS)}")
+
+
+class TokenStream(list):
+    """
+    A list of word tokens that token-level operations accept in place of text. Pipelines pass it between consecutive
+    token-level operations so the text is tokenized once and only joined back into a string when needed.
+    """
+    def __init__(self, tokens: Iterable[str] = (), tokenizer: str = 'treebank'):
+        super().__init__(tokens)
+        self.tokenizer = tokenizer
+
+    def to_text(self) -> str:
+        return ' '.join(self)
+
+
+def word_tokenize(text: str, tokenizer: str = 'treebank') -> List[str]:
+    """
+    Tokenizes text into words. The 'treebank' tokenizer is NLTK's word_tokenize, which splits sentences and then runs
+    the Treebank substitutions on each of them. The 'regex' tokenizer finds the same tokens on common English text
+    with a single compiled pattern and no sentence splitting, several times faster; see agreement_report.
+
+    Parameters:
+    - text (str): The input text.
+    - tokenizer (str): The tokenizer to use. Options are 'treebank' and 'regex'. Default is 'treebank'.
+
+    Returns:
+    - List[str]: The word tokens of the text.
+    """
+    return _tokenizer(tokenizer)(text)
+
+
+def tokenize(text: str, tokenizer: str = 'treebank') -> TokenStream:
+    """
+    Tokenizes text into a token stream.
+
+    Parameters:
+    - text (str): The input text.
+    - tokenizer (str): The tokenizer to use. Options are 'treebank' and 'regex'. Default is 'treebank'.
+
+    Returns:
+    - TokenStream: The word tokens of the text.
+    """
+    return TokenStream(_tokenizer(tokenizer)(text), tokenizer)
+
+
+def tokens_of(text: Union[str, TokenStream], tokenizer: str = 'treebank') -> List[str]:
+    """
+    Returns the tokens of the input, tokenizing it only if it is not already a token stream. A token stream is used
+    as it is, whichever tokenizer produced it.
+
+    Parameters:
+    - text (Union[str, TokenStream]): The input text or token stream.
+    - tokenizer (str): The tokenizer to use for text. Options are 'treebank' and 'regex'. Default is 'treebank'.
+
+    Returns:
+    - List[str]: The word tokens.
+    """
+    tokenize_text = _tokenizer(tokenizer)
+    return text if isinstance(text, TokenStream) else tokenize_text(text)
+
+
+def like_input(text: Union[str, TokenStream], tokens: List[str]) -> Union[str, TokenStream]:
+    """
+    Wraps processed tokens in the same form as the input: a token stream for a token stream, joined text otherwise.
+
+    Parameters:
+    - text (Union[str, TokenStream]): The original input.
+    - tokens (List[str]): The processed tokens.
+
+    Returns:
+    - Union[str, TokenStream]: The processed tokens in the form of the input.
+    """
+    return TokenStream(tokens, text.tokenizer) if isinstance(text, TokenStream) else ' '.join(tokens)
+
+
+def agreement_report(texts: Iterable[str]) -> Dict[str, float]:
+    """
+    Measures how closely the 'regex' tokenizer agrees with the 'treebank' tokenizer on a sample of texts. Token
+    precision and recall count the regex tokens that match Treebank tokens, position aside, as a bag of words.
+
+    Parameters:
+    - texts (Iterable[str]): The sample texts.
+
+    Returns:
+    - Dict[str, float]: The number of texts, the share of texts tokenized identically, and the token precision and recall.
+    """
+    count = exact = matched = regex_total = treebank_total = 0
+
+    for text in texts:
+        regex_tokens = _regex_tokenize(text)
+        treebank_tokens = _word_tokenize(text)
+        count += 1
+        exact += regex_tokens == treebank_tokens
+        matched += sum((collections.Counter(regex_tokens) & collections.Counter(treebank_tokens)).values())
+        regex_total += len(regex_tokens)
+        treebank_total += len(treebank_tokens)
+
+    return {
+        "texts": count,
+        "exact_match": exact / count if count else 1.0,
+        "precision": matched / regex_total if regex_total else 1.0,
+        "recall": matched / treebank_total if treebank_total else 1.0,
+    }
@@ -1,7 +1,7 @@
 # Import third-party libraries
 import inspect
 from flask_restx import Resource
-from typing import Dict, Any
+from typing import Any, Dict, List, Union
 
 # Import project code
 from . import transformer_utils
@@ -21,7 +21,7 @@ class ChangeCaseResource(Resource):
         """
         try:
             data: Dict[str, Any] = api.payload    
-            text: str = data.get("text", "''")
+            text: Union[str, List[str]] = data.get("text", "''")
             case: str = data.get("case", "lower")
 
             if not text:
@@ -44,7 +44,7 @@ class ConvertNumbersToWordsResource(Resource):
         """
         try:
             data: Dict[str, Any] = api.payload    
-            text: str = data.get("text", "")
+            text: Union[str, List[str]] = data.get("text", "")
 
             if not text:
                 return {"error": "No text provided."}, 400
@@ -66,7 +66,7 @@ class ConvertWordsToNumbersResource(Resource):
         """
         try:
             data: Dict[str, Any] = api.payload    
-            text: str = data.get("text", "''")
+            text: Union[str, List[str]] = data.get("text", "''")
             
             if not text:
                 return {"error": "No text provided."}, 400
@@ -88,7 +88,7 @@ class ReplaceWordsResource(Resource):
         """
         try:
             data: Dict[str, Any] = api.payload
-            text: str = data.get("text", "")
+            text: Union[str, List[str]] = data.get("text", "")
             replacement_dict: dict = data.get("replacement_dict", {})
             case_sensitive: bool = data.get("case_sensitive", False)
 
@@ -1,22 +1,33 @@
 # Import standard libraries
+import functools
 import re
-from typing import Dict
+from collections.abc import Mapping as _Mapping
+from typing import FrozenSet, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
 
 # Import third-party libraries
+import ahocorasick
 from num2words import num2words as _num2words
 from word2number import w2n
 
+# Import project code
+from api import batch
 
-def change_case(text: str, case: str = 'lower') -> str:
+_NUMBER_RE = re.compile(r'\b\d+\b')
+
+# Maximum number of replacement dictionaries whose automaton is kept.
+REPLACEMENT_CACHE_SIZE = 32
+
+
+def change_case(text: Union[str, List[str]], case: str = 'lower') -> Union[str, List[str]]:
     """
     Changes the case of the text based on the selected case type.
 
     Parameters:
-    - text (str): The input text.
+    - text (Union[str, List[str]]): The input text, or a list of texts.
     - case (str): The type of case - either 'lower', 'upper', 'title', or 'capitalize'. Defaults to 'lower'.
 
     Returns:
-    - str: The text in the specified case type.
+    - Union[str, List[str]]: The text in the specified case type, or a list of such texts.
     """
     cases = ['lower', 'upper', 'title', 'capitalize']
     if case not in cases:
@@ -24,65 +35,176 @@ def change_case(text: str, case: str = 'lower') -> str:
             f"Invalid case type: '{case}'. Valid options are {', '.join(cases)}")
 
     if case == 'lower':
-        return text.lower()
+        process = str.lower
     elif case == 'upper':
-        return text.upper()
+        process = str.upper
     elif case == 'title':
-        return text.title()
+        process = str.title
     elif case == 'capitalize':
-        return text.capitalize()
+        process = str.capitalize
 
+    return batch.apply(process, text)
 
-def convert_numbers_to_words(text: str) -> str:
+
+def convert_numbers_to_words(text: Union[str, List[str]]) -> Union[str, List[str]]:
     """
     This method converts numbers in the text to their corresponding words.
 
     Parameters:
-    - text (str): The input text.
+    - text (Union[str, List[str]]): The input text, or a list of texts.
 
     Returns:
-    - str: The text with numbers converted to words.
+    - Union[str, List[str]]: The text with numbers converted to words, or a list of such texts.
     """
     def replace_with_words(match):
         number = match.group(0)
         return _num2words(number)
-    return re.sub(r'\b\d+\b', replace_with_words, text)
 
+    def process(s: str) -> str:
+        return _NUMBER_RE.sub(replace_with_words, s)
+
+    return batch.apply(process, text)
 
-def convert_words_to_numbers(text: str) -> str:
+
+def convert_words_to_numbers(text: Union[str, List[str]]) -> Union[str, List[str]]:
     """
     This method converts words in the text to their corresponding numbers.
 
     Parameters:
-    - text (str): The input text.
+    - text (Union[str, List[str]]): The input text, or a list of texts.
 
     Return:
-    - str: The text with words converted to numbers.
+    - Union[str, List[str]]: The text with words converted to numbers, or a list of such texts.
+    """
+    def process(s: str) -> str:
+        words = s.split()
+        converted_words = [w2n.word_to_num(word) if word.isalpha() and
+                           word.lower() in w2n.american_number_system else
+                           word for word in words]
+        return ' '.join(map(str, converted_words))
+
+    return batch.apply(process, text)
+
+
+def _lower(text: str) -> str:
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # A few characters lowercase to several, which would shift match positions; those are kept as they are.
+        lowered = ''.join(char if len(char.lower()) != 1 else char.lower() for char in text)
+    return lowered
+
+
+def _is_word_character(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+def _is_word_boundary(text: str, index: int) -> bool:
+    # The same test as \b in regular expressions: a word character on exactly one side of the index.
+    before = index > 0 and _is_word_character(text[index - 1])
+    after = index < len(text) and _is_word_character(text[index])
+    return before != after
+
+
+def _build_automaton(replacements: Iterable[Tuple[str, str]], case_sensitive: bool) -> Optional[ahocorasick.Automaton]:
+    """
+    Builds an Aho-Corasick automaton over the words to replace, lowercased unless case_sensitive. Words are added in
+    sorted order and the first of several that lowercase alike wins, so the result does not depend on dictionary order.
+    """
+    words = {}
+    for word, replacement in sorted(replacements):
+        if word:
+            words.setdefault(word if case_sensitive else _lower(word), replacement)
+
+    if not words:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for key, replacement in words.items():
+        automaton.add_word(key, (len(key), replacement))
+    automaton.make_automaton()
+    return automaton
+
+
+@functools.lru_cache(maxsize=REPLACEMENT_CACHE_SIZE)
+def _replacement_automaton(replacements: FrozenSet[Tuple[str, str]], case_sensitive: bool) -> Optional[ahocorasick.Automaton]:
+    return _build_automaton(replacements, case_sensitive)
+
+
+class Replacements(_Mapping):
+    """
+    An immutable replacement dictionary for replace_words that keeps the automata built from it. Passing the same
+    Replacements to many calls skips reading the dictionary again, which a plain dictionary needs for its cache key.
     """
-    words = text.split()
-    converted_words = [w2n.word_to_num(word) if word.isalpha() and
-                       word.lower() in w2n.american_number_system else
-                       word for word in words]
-    return ' '.join(map(str, converted_words))
+    def __init__(self, replacements: Union[Mapping[str, str], Iterable[Tuple[str, str]]] = ()):
+        self._replacements = dict(replacements)
+        self._automata = {}
+
+    def __getitem__(self, word: str) -> str:
+        return self._replacements[word]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._replacements)
 
+    def __len__(self) -> int:
+        return len(self._replacements)
 
-def replace_words(text: str, replacement_dict: Dict[str, str], case_sensitive: bool = False) -> str:
+    def _automaton(self, case_sensitive: bool) -> Optional[ahocorasick.Automaton]:
+        if case_sensitive not in self._automata:
+            self._automata[case_sensitive] = _build_automaton(self._replacements.items(), case_sensitive)
+        return self._automata[case_sensitive]
+
+
+def _replace_words(automaton: ahocorasick.Automaton, case_sensitive: bool, text: str) -> str:
+    haystack = text if case_sensitive else _lower(text)
+
+    # The longest match at each start that is delimited by word boundaries.
+    longest = {}
+    for end, (length, replacement) in automaton.iter(haystack):
+        start, stop = end - length + 1, end + 1
+        if stop > longest.get(start, (0, None))[0] and _is_word_boundary(text, start) and _is_word_boundary(text, stop):
+            longest[start] = (stop, replacement)
+
+    if not longest:
+        return text
+
+    # Matches are taken leftmost first and do not overlap.
+    parts = []
+    previous_stop = 0
+    for start in sorted(longest):
+        if start < previous_stop:
+            continue
+        stop, replacement = longest[start]
+        parts.append(text[previous_stop:start])
+        parts.append(replacement)
+        previous_stop = stop
+    parts.append(text[previous_stop:])
+
+    return ''.join(parts)
+
+
+def replace_words(text: Union[str, List[str]], replacement_dict: Mapping[str, str], case_sensitive: bool = False) -> Union[str, List[str]]:
     """
-    This method replaces specified words in given text according to a replacement dictionary.
+    This method replaces specified words in given text according to a replacement dictionary. The text is scanned once
+    by an automaton built over the whole dictionary, so matching time grows with the length of the text rather than
+    the size of the dictionary. Automata are cached by dictionary content, whatever its order, but finding the cached
+    automaton still reads the whole dictionary on every call; pass a Replacements to reuse a large dictionary, which
+    keeps its automata with it. Matches must start and end at word boundaries; where several words match at the same
+    position, the longest one is replaced. Without case_sensitive, words that differ only in case take the
+    replacement of the first of them in sorted order.
 
     Parameters:
-    - text (str): The input text to replace words in.
-    - replacement_dict (Dict[str, str]): The dictionary mapping words to their replacements.
+    - text (Union[str, List[str]]): The input text to replace words in, or a list of texts.
+    - replacement_dict (Mapping[str, str]): The dictionary mapping words to their replacements, or a Replacements.
     - case_sensitive (bool): Flag indicating whether the replacement should be case-sensitive. Default is False.
 
     Returns:
-    - str: The text with specified words replaced according to the replacement dictionary.
+    - Union[str, List[str]]: The text with specified words replaced according to the replacement dictionary, or a list of such texts.
     """
-    if case_sensitive:
-        regex_pattern = re.compile(
-            r'\b(' + '|'.join(re.escape(key) for key in replacement_dict.keys()) + r')\b')
-        return regex_pattern.sub(lambda x: replacement_dict[x.group()], text)
+    if isinstance(replacement_dict, Replacements):
+        automaton = replacement_dict._automaton(case_sensitive)
     else:
-        regex_pattern = re.compile(
-            r'\b(' + '|'.join(re.escape(key) for key in replacement_dict.keys()) + r')\b', re.IGNORECASE)
-        return regex_pattern.sub(lambda x: replacement_dict[x.group().lower()], text)
+        automaton = _replacement_automaton(frozenset(replacement_dict.items()), case_sensitive)
+    if automaton is None:
+        return batch.apply(lambda s: s, text)
+
+    return batch.apply(functools.partial(_replace_words, automaton, case_sensitive), text)
@@ -0,0 +1,223 @@
+# Import standard libraries
+import argparse
+import fnmatch
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Iterator, List, Optional, Tuple
+
+# Import third-party libraries
+from tqdm import tqdm
+
+# Import project code
+from api.processor import processor_utils
+
+# Number of lines read from stdin, and of files per worker, handed to the worker pool at a time. This bounds memory.
+BATCH_SIZE = 1024
+FILES_PER_WORKER = 4
+
+_operations = None
+_args = None
+
+
+def _init_worker(operations: Optional[List[str]], args: Optional[dict]) -> None:
+    global _operations, _args
+    _operations, _args = operations, args
+
+
+def _process_document(text: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Runs the configured pipeline on one document, returning its result or its error.
+    """
+    try:
+        if _operations is None:
+            return processor_utils.default_pipeline(text), None
+        return processor_utils.custom_pipeline(text, _operations, _args), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _process_file(paths: Tuple[str, str]) -> Tuple[int, Optional[str]]:
+    """
+    Runs the configured pipeline over one memory-mapped file, returning the number of bytes read or its error.
+    """
+    source, destination = paths
+    try:
+        os.makedirs(os.path.dirname(destination) or ".", exist_ok=True)
+        return processor_utils.process_file(source, destination, _operations, _args)["bytes_read"], None
+    except Exception as e:
+        return 0, str(e)
+
+
+def _list_files(paths: List[str], pattern: str) -> List[Tuple[str, str]]:
+    """
+    Expands the input paths into (file path, path relative to its input root) pairs. Directories are searched recursively.
+    """
+    files = []
+
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                for name in sorted(names):
+                    if fnmatch.fnmatch(name, pattern):
+                        file_path = os.path.join(root, name)
+                        files.append((file_path, os.path.relpath(file_path, path)))
+        elif os.path.isfile(path):
+            files.append((path, os.path.basename(path)))
+        else:
+            raise FileNotFoundError(f"No such file or directory: {path}")
+
+    return files
+
+
+def _batches(iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _read_file(path: str) -> str:
+    with open(path, encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+def _write_file(path: str, text: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+
+
+def _report(documents: int, size: int, errors: int, elapsed: float) -> None:
+    elapsed = max(elapsed, 1e-9)
+    print(f"Processed {documents} documents ({size / 1e6:.2f} MB) in {elapsed:.2f}s: "
+          f"{documents / elapsed:.1f} documents/s, {size / 1e6 / elapsed:.2f} MB/s, {errors} errors.", file=sys.stderr)
+
+
+def _run_files(pool, files: List[Tuple[str, str]], output: Optional[str], workers: int, quiet: bool) -> Tuple[int, int, int]:
+    documents = size = errors = 0
+
+    with tqdm(total=len(files), unit="doc", disable=quiet, file=sys.stderr) as progress:
+        for batch in _batches(files, workers * FILES_PER_WORKER):
+            texts = [_read_file(path) for path, _ in batch]
+            for (path, relative_path), text, (result, error) in zip(batch, texts, pool.imap(_process_document, texts)):
+                documents += 1
+                size += len(text.encode("utf-8"))
+                if error is not None:
+                    errors += 1
+                    tqdm.write(f"{path}: {error}", file=sys.stderr)
+                elif output is not None:
+                    _write_file(os.path.join(output, relative_path), result)
+                else:
+                    sys.stdout.write(f"{result}\n")
+                progress.update()
+
+    return documents, size, errors
+
+
+def _run_mapped(pool, files: List[Tuple[str, str]], output: str, quiet: bool) -> Tuple[int, int, int]:
+    documents = size = errors = 0
+    tasks = [(path, os.path.join(output, relative_path)) for path, relative_path in files]
+
+    with tqdm(total=len(tasks), unit="doc", disable=quiet, file=sys.stderr) as progress:
+        for (path, _), (bytes_read, error) in zip(tasks, pool.imap(_process_file, tasks)):
+            documents += 1
+            size += bytes_read
+            if error is not None:
+                errors += 1
+                tqdm.write(f"{path}: {error}", file=sys.stderr)
+            progress.update()
+
+    return documents, size, errors
+
+
+def _run_lines(pool, lines, quiet: bool) -> Tuple[int, int, int]:
+    documents = size = errors = 0
+
+    with tqdm(unit="doc", disable=quiet, file=sys.stderr) as progress:
+        for batch in _batches((line.rstrip("\r\n") for line in lines), BATCH_SIZE):
+            for line, (result, error) in zip(batch, pool.imap(_process_document, batch, chunksize=64)):
+                documents += 1
+                size += len(line.encode("utf-8"))
+                if error is not None:
+                    errors += 1
+                    tqdm.write(f"line {documents}: {error}", file=sys.stderr)
+                    sys.stdout.write("\n")
+                else:
+                    sys.stdout.write(f"{result}\n")
+                progress.update()
+
+    return documents, size, errors
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Apply a text processing pipeline to files, directories or stdin without going through the API.")
+    parser.add_argument("paths", nargs="*",
+                        help="Input files or directories. Reads one document per line from stdin if omitted or '-'.")
+    parser.add_argument("-o", "--output",
+                        help="Directory to write processed files to, mirroring the input layout. Writes to stdout if omitted.")
+    parser.add_argument("--operations", nargs="+",
+                        help="An ordered series of operations to run. The default pipeline is used if omitted.")
+    parser.add_argument("--args", default="{}",
+                        help="JSON object mapping operations to their arguments.")
+    parser.add_argument("--pattern", default="*.txt",
+                        help="File name pattern used when searching directories. Defaults to '*.txt'.")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes. Defaults to the number of CPUs.")
+    parser.add_argument("--mmap", action="store_true",
+                        help="Memory-map each file and process it in line-aligned chunks instead of reading it whole, "
+                             "so files larger than memory can be processed. Requires --output and operations that are "
+                             "local to a line; without --operations, those of the default pipeline are used.")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="Hide the progress bar.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    options = _parse_args(argv)
+
+    try:
+        args = json.loads(options.args)
+        if options.operations is not None:
+            processor_utils.compile_pipeline(options.operations, args)
+            if options.mmap:
+                processor_utils.check_line_local(options.operations, args)
+    except ValueError as e:
+        print(f"Invalid pipeline: {str(e)}", file=sys.stderr)
+        return 2
+
+    read_stdin = not options.paths or options.paths == ["-"]
+    if options.mmap and (read_stdin or options.output is None):
+        print("--mmap requires input paths and --output.", file=sys.stderr)
+        return 2
+
+    try:
+        files = [] if read_stdin else _list_files(options.paths, options.pattern)
+    except FileNotFoundError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+
+    workers = max(options.workers, 1)
+    start = time.perf_counter()
+
+    with multiprocessing.Pool(workers, _init_worker, (options.operations, args)) as pool:
+        if read_stdin:
+            documents, size, errors = _run_lines(pool, sys.stdin, options.quiet)
+        elif options.mmap:
+            documents, size, errors = _run_mapped(pool, files, options.output, options.quiet)
+        else:
+            documents, size, errors = _run_files(pool, files, options.output, workers, options.quiet)
+
+    _report(documents, size, errors, time.perf_counter() - start)
+
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,67 @@
+# Import standard libraries
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+# Import project code
+import cli
+from api.processor import processor_utils
+
+
+class TestCli(unittest.TestCase):
+    def test_mmap(self):
+        text = "Hello (World) 42\n" * 100
+        operations = ['change_case', 'remove_numbers']
+
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'in', 'nested', 'log.txt')
+            output = os.path.join(directory, 'out')
+            os.makedirs(os.path.dirname(source))
+            with open(source, 'w', encoding='utf-8', newline='') as f:
+                f.write(text)
+
+            with contextlib.redirect_stderr(io.StringIO()):
+                code = cli.main([os.path.join(directory, 'in'), '-o', output, '--mmap', '-q', '-w', '1',
+                                 '--operations', *operations])
+            self.assertEqual(code, 0)
+            with open(os.path.join(output, 'nested', 'log.txt'), encoding='utf-8', newline='') as f:
+                self.assertEqual(f.read(), processor_utils.custom_pipeline(text, operations, {}))
+
+            with contextlib.redirect_stderr(io.StringIO()) as stderr:
+                code = cli.main([source, '-o', output, '--mmap', '--operations', 'remove_whitespace'])
+            self.assertEqual(code, 2)
+            self.assertIn("Invalid pipeline", stderr.getvalue())
+
+            with contextlib.redirect_stderr(io.StringIO()):
+                self.assertEqual(cli.main([source, '--mmap', '--operations', *operations]), 2)
+
+
+    def test_mmap_in_place(self):
+        text = "Hello (World) 42\n" * 100
+        operations = ['change_case', 'remove_numbers']
+
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'log.txt')
+            with open(source, 'w', encoding='utf-8', newline='') as f:
+                f.write(text)
+
+            with contextlib.redirect_stderr(io.StringIO()):
+                code = cli.main([directory, '-o', directory, '--mmap', '-q', '-w', '1', '--operations', *operations])
+            self.assertEqual(code, 0)
+            with open(source, encoding='utf-8', newline='') as f:
+                self.assertEqual(f.read(), processor_utils.custom_pipeline(text, operations, {}))
+            self.assertEqual(os.listdir(directory), ['log.txt'])
+
+
+    def test_missing_path(self):
+        with tempfile.TemporaryDirectory() as directory, contextlib.redirect_stderr(io.StringIO()) as stderr:
+            code = cli.main([os.path.join(directory, 'missing.txt')])
+        self.assertEqual(code, 2)
+        self.assertIn("No such file or directory", stderr.getvalue())
+        self.assertNotIn("Traceback", stderr.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
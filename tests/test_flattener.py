@@ -2,7 +2,9 @@
 import unittest
 
 # Import project code
+from api.flattener import flattener_utils
 from api.flattener.flattener_utils import *
+from api.token_stream import TokenStream
 
 class TestFlattenerFunctions(unittest.TestCase):
     def test_handle_line_feeds(self):
@@ -19,12 +21,44 @@ class TestFlattenerFunctions(unittest.TestCase):
         text = "Hello (world) [hello] {world}"
         self.assertEqual(remove_brackets(text), "Hello   ")
 
+    def test_remove_brackets_nested(self):
+        self.assertEqual(remove_brackets("a (b (c) d) e"), "a  e")
+        self.assertEqual(remove_brackets("(open (inner) tail"), "(open  tail")
+        self.assertEqual(remove_brackets("keep (across\nlines) as is"), "keep (across\nlines) as is")
+        self.assertEqual(remove_brackets("(" * 10000 + "x"), "(" * 10000 + "x")
+
+
+    def test_remove_brackets_crossed(self):
+        self.assertEqual(remove_brackets("(a [b) c"), " c")
+        self.assertEqual(remove_brackets("[a (b] c)"), " c)")
+        self.assertEqual(remove_brackets("x (a {b [c) d"), "x  d")
+        self.assertEqual(remove_brackets("(" * 5000 + "]" * 5000), "(" * 5000 + "]" * 5000)
+
+
+    def test_remove_brackets_unbalanced(self):
+        self.assertEqual(remove_brackets("a (b [c) d"), "a  d")
+        self.assertEqual(remove_brackets("a [b (c] d"), "a  d")
+        self.assertEqual(remove_brackets("a (b [c d"), "a (b [c d")
+        self.assertEqual(remove_brackets("a (b) c]"), "a  c]")
+        self.assertEqual(remove_brackets("a (b\nc) d"), "a (b\nc) d")
+
 
     def test_remove_html_tags(self):
         text = "<p>Hello</p> World"
         self.assertEqual(remove_html_tags(text), " Hello World")
 
 
+    def test_remove_html_tags_stream(self):
+        text = "<html><head><style>p {}</style><script>var a = '<b>';</script></head><body><p>Fish &amp; chips</p>x<br>y</body></html>"
+        self.assertEqual(remove_html_tags(text), "   Fish & chips xy  ")
+
+        text = "<div>A<br>B</div><ul><li>1</li><li>2</li></ul> a &lt; b <!-- comment -->"
+        self.assertEqual(remove_html_tags(text), remove_html_tags(text, 'soup'))
+
+        with self.assertRaises(ValueError):
+            remove_html_tags(text, 'invalid')
+
+
     def test_remove_list_markers(self):
         text = "1. Hello 2) World i. Hello ii) World"
         self.assertEqual(remove_list_markers(text), " Hello  World  Hello  World")
@@ -42,6 +76,13 @@ class TestFlattenerFunctions(unittest.TestCase):
         self.assertEqual(remove_stopwords(text), "This test string")
 
 
+    def test_remove_stopwords_custom_list(self):
+        tokens = TokenStream(["the", "cat", "sat", "on", "the", "mat"])
+        self.assertEqual(remove_stopwords(tokens, stop_words=["the", "on"]), ["cat", "sat", "mat"])
+        self.assertEqual(remove_stopwords(tokens, stop_words={"cat"}), ["the", "sat", "on", "the", "mat"])
+        self.assertIs(flattener_utils._custom_stopwords(("the", "on")), flattener_utils._custom_stopwords(("the", "on")))
+
+
     def test_remove_whitespace(self):
         text = " Hello   World "
         self.assertEqual(remove_whitespace(text, 'leading'), "Hello   World ")
@@ -53,5 +94,17 @@ class TestFlattenerFunctions(unittest.TestCase):
             remove_whitespace(text, 'invalid')
 
 
+    def test_batch_input(self):
+        texts = [" Hello   World ", "(aside) text", " Hello   World "]
+        self.assertEqual(remove_whitespace(texts), ["Hello World", "(aside) text", "Hello World"])
+        self.assertEqual(remove_brackets(texts), [" Hello   World ", " text", " Hello   World "])
+        self.assertEqual(handle_line_feeds(["a\nb", "c\r\nd"], 'lf'), ["a\nb", "c\nd"])
+        self.assertEqual(remove_special_characters(["a#b", "c$d"], custom_characters="#"), ["ab", "c$d"])
+        self.assertEqual(remove_whitespace([]), [])
+
+        with self.assertRaises(ValueError):
+            remove_whitespace(texts, 'invalid')
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,9 @@
 # Import standard libraries
 import unittest
 
+# Import third-party libraries
+import contractions
+
 # Import project code
 from api.normalizer.normalizer_utils import *
 
@@ -11,6 +14,19 @@ class TestNormalizerFunctions(unittest.TestCase):
         self.assertEqual(expand_contractions(text), 
                          "You have won! Is not it great? It is your day.")
 
+    def test_expand_contractions_matches_contractions_fix(self):
+        texts = ["I CAN'T go, y'all. Howd'y'all've been?", "She'd've known WE'RE late... ain't it?",
+                 "how’d’y’all’ve  WHY’Sisn't who're’hadnt", "Goin' to the shop 'cause it's Jan. 5th",
+                 "doesn'tmatter, ur gonna lovin' it", "Oh YOU'Re here? Can'T stay. shouldn't've", ""]
+        for text in texts:
+            self.assertEqual(expand_contractions(text), contractions.fix(text))
+
+    def test_expand_contractions_extra_contractions(self):
+        text = "See you l8r, I'll be there. L8R!"
+        self.assertEqual(expand_contractions(text, {"l8r": "later", "i'll": "I shall"}),
+                         "See you later, I shall be there. LATER!")
+        self.assertEqual(expand_contractions(text), "See you l8r, I will be there. L8R!")
+
 
     def test_lemmatize_text(self):
         text = "Running faster won't help if you're moving in the wrong direction."
@@ -18,11 +34,26 @@ class TestNormalizerFunctions(unittest.TestCase):
                          "Running fast wo n't help if you 're moving in the wrong direction.")
 
 
+    def test_lemmatize_text_batch(self):
+        texts = ["The cats are running.", "The cats sat."]
+        self.assertEqual(lemmatize_text(texts), [lemmatize_text(text) for text in texts])
+        self.assertEqual(lemmatize_text(TokenStream(["cats", "geese"])), ["cat", "goose"])
+
+
     def test_normalize_unicode(self):
         text = "Cliché is a cliché. Résumé is commonly used."
         self.assertEqual(normalize_unicode(text), 
                          "Cliche is a cliche. Resume is commonly used.")
 
+    def test_normalize_unicode_options(self):
+        text = "Cliché ﬁnale in STRAẞE"
+        self.assertEqual(normalize_unicode(text, casefold=True), "cliche finale in strae")
+        self.assertEqual(normalize_unicode(text, form='NFC', ascii_only=False), "Cliché ﬁnale in STRAẞE")
+        self.assertEqual(normalize_unicode(text, form='nfkc', ascii_only=False, casefold=True), "cliché finale in strasse")
+        self.assertEqual(normalize_unicode("Plain ASCII text.", casefold=True), "plain ascii text.")
+        with self.assertRaises(ValueError):
+            normalize_unicode(text, form='NFX')
+
 
     def test_remove_numbers(self):
         text = "123hello456world789"
@@ -44,5 +75,27 @@ class TestNormalizerFunctions(unittest.TestCase):
             stem_text(text, 'invalid_stemmer')
 
 
+    def test_stem_text_token_stream(self):
+        result = stem_text(TokenStream(["Running", "cats"]), 'porter')
+        self.assertIsInstance(result, TokenStream)
+        self.assertEqual(result, ["run", "cat"])
+
+        result = stem_text(TokenStream(["running", "runs", "running"]), 'lancaster')
+        self.assertEqual(result, ["run", "run", "run"])
+
+
+    def test_stem_text_batch(self):
+        texts = ["Running cats", "Cats running fast"]
+        self.assertEqual(stem_text(texts), [stem_text(text) for text in texts])
+
+
+    def test_stem_text_regex_tokenizer(self):
+        result = stem_text("running faster won't help.", 'porter', 'regex')
+        self.assertEqual(result, "run faster wo n't help .")
+
+        result = stem_text(["running cats", "running cats"], 'porter', 'regex')
+        self.assertEqual(result, ["run cat", "run cat"])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,8 +1,25 @@
 # Import standard libraries
+import io
+import json
+import os
+import sys
+import tempfile
+import time
 import unittest
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
 
 # Import project code
+from api.flattener import flattener_utils
+from api.normalizer import normalizer_utils
+from api.processor import processor_utils
 from api.processor.processor_utils import *
+from api.processor.processor_utils import _ResultCache
+from api.segmenter import segmenter_utils
+from api.token_stream import TokenStream
+from api.transformer import transformer_utils
+from app import app
 
 
 class TestProcessorFunctions(unittest.TestCase):
@@ -26,6 +43,254 @@ class TestProcessorFunctions(unittest.TestCase):
             custom_pipeline(text, ['invalid_operation'], {})
 
 
+    def test_compile_pipeline(self):
+        operations = ['remove_whitespace', 'change_case']
+        plan = compile_pipeline(operations, {'change_case': {'case': 'upper'}, 'unused': {'x': 1}})
+        self.assertIs(plan, compile_pipeline(operations, {'change_case': {'case': 'upper'}}))
+        self.assertEqual([stage.name for stage in plan], operations)
+        self.assertEqual(custom_pipeline("  Hello   World ", operations, {'change_case': {'case': 'upper'}}), "HELLO WORLD")
+
+        with self.assertRaises(ValueError):
+            compile_pipeline(['change_case'], {'change_case': {'unknown': True}})
+
+        with self.assertRaises(ValueError):
+            compile_pipeline(['_deletion_table'], {})
+
+
+    def test_fused_pipeline(self):
+        operations = ['change_case', 'handle_line_feeds', 'remove_special_characters', 'remove_punctuation', 'remove_numbers']
+        plan = compile_pipeline(operations, {'change_case': {'case': 'lower'}})
+        self.assertEqual([stage.name for stage in plan], ['+'.join(operations)])
+
+        for text in ["Hello, World!\r\nIt's 42_DAYS — Résumé", "ΟΔΟΣ ΣΑΣ\n", ""]:
+            expected = transformer_utils.change_case(text, 'lower')
+            expected = flattener_utils.handle_line_feeds(expected)
+            expected = flattener_utils.remove_special_characters(expected)
+            expected = normalizer_utils.remove_punctuation(expected)
+            expected = normalizer_utils.remove_numbers(expected)
+            self.assertEqual(custom_pipeline(text, operations, {'change_case': {'case': 'lower'}}), expected)
+
+        plan = compile_pipeline(['change_case', 'remove_punctuation'], {'remove_punctuation': {'remove_duplicates': True}})
+        self.assertEqual([stage.name for stage in plan], ['change_case', 'remove_punctuation'])
+
+
+    def test_token_stream_pipeline(self):
+        operations = ['remove_stopwords', 'stem_text', 'change_case']
+        args = {'remove_stopwords': {'stop_words': ['the', 'are']}, 'change_case': {'case': 'upper'}}
+        plan = compile_pipeline(operations, args)
+        self.assertEqual([stage.token_level for stage in plan], [True, True, False])
+
+        tokens = TokenStream(['the', 'cats', 'are', 'running'])
+        self.assertEqual(custom_pipeline(tokens, operations, args), "CAT RUN")
+        self.assertEqual(custom_pipeline(tokens, operations[:2], args), "cat run")
+
+
+    def test_profile_pipeline(self):
+        operations = ['remove_whitespace', 'change_case', 'remove_punctuation']
+        result, profile = profile_pipeline(" Hello,  World! ", operations, {'change_case': {'case': 'upper'}})
+        self.assertEqual(result, "HELLO WORLD")
+        self.assertEqual([stage['operation'] for stage in profile], ['remove_whitespace', 'change_case+remove_punctuation'])
+        self.assertEqual(profile[0]['input_length'], 16)
+        self.assertEqual(profile[1]['output_length'], 11)
+        for stage in profile:
+            self.assertGreaterEqual(stage['wall_time_ms'], 0)
+            self.assertGreaterEqual(stage['cpu_time_ms'], 0)
+            self.assertGreaterEqual(stage['peak_memory_bytes'], 0)
+
+
+    def test_profile_pipeline_concurrent(self):
+        text = "Hello World " * 100000
+        run_stage = processor_utils._run_stage
+        active, overlaps = [], []
+
+        def slow_stage(stage, value):
+            active.append(stage)
+            overlaps.append(len(active))
+            time.sleep(0.05)
+            active.pop()
+            return run_stage(stage, value)
+
+        with mock.patch.object(processor_utils, '_run_stage', slow_stage), ThreadPoolExecutor(max_workers=4) as executor:
+            runs = list(executor.map(lambda _: profile_pipeline(text, ['change_case']), range(4)))
+
+        self.assertEqual(max(overlaps), 1)
+        for result, profile in runs:
+            self.assertEqual(result, text.lower())
+            self.assertGreaterEqual(profile[0]['peak_memory_bytes'], len(text))
+
+
+    def test_batch_pipeline(self):
+        operations = ['remove_whitespace', 'change_case']
+        args = {'change_case': {'case': 'upper'}}
+        texts = [" Hello  World ", "", "lovely   day"]
+        self.assertEqual(batch_pipeline(texts, operations, args),
+                         [{'result': "HELLO WORLD"}, {'error': "No text provided."}, {'result': "LOVELY DAY"}])
+
+        many = ["text %d" % i for i in range(BATCH_POOL_THRESHOLD * 2)]
+        self.assertEqual(batch_pipeline(many, operations, args), [{'result': text.upper()} for text in many])
+
+        with self.assertRaises(ValueError):
+            batch_pipeline(texts, ['invalid_operation'])
+
+
+    def test_stream_pipeline(self):
+        records = [
+            {'id': 1, 'text': " Hello  World ", 'operations': ['remove_whitespace', 'change_case'], 'args': {'change_case': {'case': 'upper'}}},
+            {'id': 2, 'text': ""},
+            {'text': "Hello", 'operations': ['invalid_operation']},
+        ]
+        stream = io.BytesIO(("\n".join(json.dumps(record) for record in records) + "\n\nnot json\n").encode('utf-8'))
+        results = [json.loads(line) for line in stream_pipeline(stream)]
+        self.assertEqual(results[0], {'id': 1, 'result': "HELLO WORLD"})
+        self.assertEqual(results[1], {'id': 2, 'error': "No text provided."})
+        self.assertIn('error', results[2])
+        self.assertIn('line 5', results[3]['error'])
+        self.assertEqual(len(results), 4)
+
+        records = [{'id': 1, 'text': "bad"}, {'id': 2, 'text': "ok", 'operations': ['remove_whitespace']}]
+        stream = io.BytesIO("\n".join(json.dumps(record) for record in records).encode('utf-8'))
+        with mock.patch.object(processor_utils, '_execute', side_effect=[object(), "ok"]):
+            results = [json.loads(line) for line in stream_pipeline(stream)]
+        self.assertEqual(results[0]['id'], 1)
+        self.assertIn('could not be serialized', results[0]['error'])
+        self.assertEqual(results[1], {'id': 2, 'result': "ok"})
+
+
+    def test_result_cache(self):
+        clear_result_cache()
+        operations = ['remove_whitespace', 'change_case']
+        before = result_cache_stats()
+        self.assertEqual(custom_pipeline(" a  b ", operations, {}, use_cache=True), "a b")
+        self.assertEqual(custom_pipeline(" a  b ", operations, {}, use_cache=True), "a b")
+        self.assertEqual(batch_pipeline([" a  b ", "c"], operations, {}, use_cache=True), [{'result': "a b"}, {'result': "c"}])
+        after = result_cache_stats()
+        self.assertEqual(after['hits'] - before['hits'], 2)
+        self.assertEqual(after['misses'] - before['misses'], 2)
+
+        cache = _ResultCache(max_bytes=200, ttl=60)
+        cache.put('a', "x" * 40)
+        cache.put('b', "y" * 40)
+        cache.put('c', "z" * 40)
+        self.assertEqual(cache.get('a'), (False, None))
+        self.assertEqual(cache.get('c'), (True, "z" * 40))
+        self.assertGreater(cache.stats()['evictions'], 0)
+
+        counts = {"n-gram %d" % i: i for i in range(10)}
+        small = _ResultCache(max_bytes=sys.getsizeof(counts) + 100, ttl=60)
+        small.put('d', counts)
+        self.assertEqual(small.get('d'), (False, None))
+
+        ngrams = ['extract_ngrams']
+        result = custom_pipeline("a b c", ngrams, {}, use_cache=True)
+        result.append("mutated")
+        self.assertEqual(custom_pipeline("a b c", ngrams, {}, use_cache=True), ["a b", "b c"])
+        cached = custom_pipeline("a b c", ngrams, {}, use_cache=True)
+        cached.clear()
+        self.assertEqual(custom_pipeline("a b c", ngrams, {}, use_cache=True), ["a b", "b c"])
+
+        expired = _ResultCache(max_bytes=200, ttl=-1)
+        expired.put('a', "x")
+        self.assertEqual(expired.get('a'), (False, None))
+
+
+    def test_process_file(self):
+        text = "Hello (World), it is 42 DAYS!!!\r\n" * 50 + "no newline at the end"
+        operations = ['change_case', 'remove_brackets', 'remove_numbers', 'remove_punctuation']
+        args = {'change_case': {'case': 'upper'}}
+
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'source.txt')
+            destination = os.path.join(directory, 'destination.txt')
+            with open(source, 'w', encoding='utf-8', newline='') as f:
+                f.write(text)
+
+            stats = process_file(source, destination, operations, args, chunk_size=100)
+            with open(destination, encoding='utf-8', newline='') as f:
+                self.assertEqual(f.read(), custom_pipeline(text, operations, args))
+            self.assertEqual(stats['bytes_read'], len(text))
+            self.assertGreater(stats['chunks'], 1)
+
+            with self.assertRaises(ValueError):
+                process_file(source, destination, ['remove_whitespace'])
+
+            # Removing line feeds joins lines, so it only composes line by line as the last operation.
+            operations = ['remove_brackets', 'handle_line_feeds']
+            process_file(source, destination, operations, chunk_size=100)
+            with open(destination, encoding='utf-8', newline='') as f:
+                self.assertEqual(f.read(), custom_pipeline(text, operations, {}))
+            with self.assertRaises(ValueError):
+                process_file(source, destination, ['handle_line_feeds', 'remove_brackets'])
+
+
+    def test_registered_pipeline(self):
+        operations = ['remove_whitespace', 'change_case']
+        args = {'change_case': {'case': 'upper'}}
+
+        with tempfile.TemporaryDirectory() as directory, mock.patch.object(processor_utils, 'PIPELINE_REGISTRY_DIR', directory):
+            pipeline_id = register_pipeline(operations, args)
+            self.assertEqual(register_pipeline(operations, args), pipeline_id)
+            self.assertEqual(get_pipeline(pipeline_id), {'operations': operations, 'args': args})
+            self.assertEqual(run_registered_pipeline(" a  b ", pipeline_id), "A B")
+
+            processor_utils._registry.clear()
+            self.assertEqual(run_registered_pipeline(" c  d ", pipeline_id), "C D")
+
+            self.assertIsNone(get_pipeline('0' * 32))
+            self.assertIsNone(get_pipeline('../etc/passwd'))
+            with self.assertRaises(KeyError):
+                run_registered_pipeline("text", '0' * 32)
+            with self.assertRaises(ValueError):
+                register_pipeline(['invalid_operation'])
+
+            self.assertTrue(delete_pipeline(pipeline_id))
+            self.assertFalse(delete_pipeline(pipeline_id))
+            self.assertIsNone(get_pipeline(pipeline_id))
+            self.assertEqual(os.listdir(directory), [])
+
+            with mock.patch.object(processor_utils, 'PIPELINE_REGISTRY_MAX', 1):
+                pipeline_id = register_pipeline(operations, args)
+                self.assertEqual(register_pipeline(operations, args), pipeline_id)
+                with self.assertRaises(RuntimeError):
+                    register_pipeline(['remove_whitespace'])
+                delete_pipeline(pipeline_id)
+                register_pipeline(['remove_whitespace'])
+
+
+    def test_incremental_pipeline(self):
+        operations = ['change_case', 'remove_brackets', 'handle_line_feeds', 'remove_whitespace']
+        args = {'change_case': {'case': 'upper'}, 'handle_line_feeds': {'mode': 'lf'}}
+        text = "First (one)  paragraph.\r\n\r\nSecond\nparagraph.\n \n\nThird."
+        edited = text.replace("Third", "Edited third")
+
+        self.assertEqual(incremental_pipeline(text, operations, args), custom_pipeline(text, operations, args))
+        before = result_cache_stats()['paragraphs']
+        self.assertEqual(incremental_pipeline(edited, operations, args), custom_pipeline(edited, operations, args))
+        after = result_cache_stats()['paragraphs']
+        self.assertEqual(after['hits'] - before['hits'], 2)
+        self.assertEqual(after['misses'] - before['misses'], 1)
+
+        self.assertEqual(incremental_pipeline("Hello  World", ['remove_whitespace']), "Hello World")
+
+        text = "Keep (drop\n\nthis) end"
+        operations = ['handle_line_feeds', 'remove_brackets']
+        self.assertEqual(incremental_pipeline(text, operations, {}), custom_pipeline(text, operations, {}))
+
+
+    def test_jobs(self):
+        job_id = submit_job(" Hello  World ", ['remove_whitespace', 'change_case'], {'change_case': {'case': 'upper'}})
+        deadline = time.monotonic() + 60
+        status = job_status(job_id)
+        while status['status'] in ('pending', 'running') and time.monotonic() < deadline:
+            time.sleep(0.05)
+            status = job_status(job_id)
+        self.assertEqual(status, {'job_id': job_id, 'status': 'completed', 'result': "HELLO WORLD"})
+
+        self.assertIsNone(job_status('unknown'))
+
+        with self.assertRaises(ValueError):
+            submit_job("Hello", ['invalid_operation'])
+
+
     def test_default_pipeline(self):
         text = "Hello, World! It's a lovely DAY!"
         expected_result = "helloworlditsalovelyday"
@@ -36,5 +301,60 @@ class TestProcessorFunctions(unittest.TestCase):
             default_pipeline(text, ['invalid_operation'], {})
 
 
+
+class TestProcessorRoutes(unittest.TestCase):
+    def setUp(self):
+        app.config['TESTING'] = True
+        self.client = app.test_client()
+
+
+    def test_run_registered_pipeline(self):
+        with tempfile.TemporaryDirectory() as directory, mock.patch.object(processor_utils, 'PIPELINE_REGISTRY_DIR', directory):
+            pipeline_id = register_pipeline(['change_case'], {'change_case': {'case': 'invalid'}})
+            response = self.client.post(f'/processor/pipelines/{pipeline_id}/run', json={'text': "Hello"})
+            self.assertEqual(response.status_code, 400)
+
+            with mock.patch.object(processor_utils, 'run_registered_pipeline', side_effect=KeyError('key')):
+                response = self.client.post(f'/processor/pipelines/{pipeline_id}/run', json={'text': "Hello"})
+            self.assertEqual(response.status_code, 500)
+
+            response = self.client.post(f'/processor/pipelines/{"0" * 32}/run', json={'text': "Hello"})
+            self.assertEqual(response.status_code, 404)
+
+
+    def test_span_operations(self):
+        self.assertIn('word_spans', list_available_methods())
+        payload = {'text': "Hello world.", 'operations': ['word_spans'], 'args': {'word_spans': {'tokenizer': 'regex'}}}
+        response = self.client.post('/processor/custom-pipeline', json=payload)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {'result': [0, 5, 6, 11, 11, 12]})
+
+        response = self.client.post('/processor/custom-pipeline/batch', json={**payload, 'texts': ["a b", "c"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['results'], [{'result': [0, 1, 2, 3]}, {'result': [0, 1]}])
+
+
+    def test_hashed_ngrams_operation(self):
+        payload = {'text': "a b c", 'operations': ['extract_ngrams'], 'args': {'extract_ngrams': {'mode': 'hashed'}}}
+        response = self.client.post('/processor/custom-pipeline', json=payload)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {'result': [zlib.crc32(b"a b"), zlib.crc32(b"b c")]})
+
+        records = [{'id': 1, 'text': "a b c", 'operations': payload['operations'], 'args': payload['args']}]
+        results = [json.loads(line) for line in stream_pipeline(io.BytesIO(json.dumps(records[0]).encode('utf-8')))]
+        self.assertEqual(results, [{'id': 1, 'result': [zlib.crc32(b"a b"), zlib.crc32(b"b c")]}])
+
+
+    def test_shingles_operation(self):
+        expected = segmenter_utils.hash_shingles("abcd", 3).tolist()
+        payload = {'text': "abcd", 'operations': ['hash_shingles'], 'args': {'hash_shingles': {'n': 3}}}
+        response = self.client.post('/processor/custom-pipeline', json=payload)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), {'result': expected})
+
+        response = self.client.post('/processor/custom-pipeline/batch', json={**payload, 'texts': ["abcd", "ab"]})
+        self.assertEqual(response.get_json()['results'], [{'result': expected}, {'result': []}])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,8 +1,13 @@
 # Import standard libraries
 import unittest
+import zlib
+
+# Import third-party libraries
+import numpy as np
 
 # Import project code
 from api.segmenter.segmenter_utils import *
+from app import app
 
 
 class TestSegmenterFunctions(unittest.TestCase):
@@ -29,6 +34,102 @@ class TestSegmenterFunctions(unittest.TestCase):
         actual_result = tokenize_words(text)
         self.assertEqual(actual_result, expected_result)
 
+    def test_extract_ngrams_modes(self):
+        text = "to be or not to be"
+        self.assertEqual(extract_ngrams(text, 1, max_n=2),
+                         ["to", "be", "or", "not", "to", "be", "to be", "be or", "or not", "not to", "to be"])
+        self.assertEqual(extract_ngrams(text, mode='counts'), {"to be": 2, "be or": 1, "or not": 1, "not to": 1})
+        self.assertEqual(extract_ngrams(text, 1, mode='top_k', k=2), [("to", 2), ("be", 2)])
+        self.assertEqual(extract_ngrams(text, mode='hashed').tolist(),
+                         [zlib.crc32(n_gram.encode('utf-8')) for n_gram in extract_ngrams(text)])
+
+        with self.assertRaises(ValueError):
+            extract_ngrams(text, mode='invalid')
+        with self.assertRaises(ValueError):
+            extract_ngrams(text, 3, max_n=2)
+
+
+    def test_extract_ngrams_top_k_bounded(self):
+        tokens = ["common"] * 500 + [f"rare{i}" for i in range(5000)] + ["frequent"] * 300
+        result = extract_ngrams("", 1, tokens=tokens, mode='top_k', k=2)
+        self.assertEqual([n_gram for n_gram, _ in result], ["common", "frequent"])
+
+
+    def test_extract_ngrams_batch(self):
+        texts = ["a b c", "d e", "a b c"]
+        result = extract_ngrams(texts)
+        self.assertEqual(result, [["a b", "b c"], ["d e"], ["a b", "b c"]])
+        self.assertIsNot(result[0], result[2])
+
+        with self.assertRaises(ValueError):
+            extract_ngrams(texts, tokens=["a", "b"])
+
+
+    def test_sentence_spans(self):
+        text = "I am a chatbot. I like to help people."
+        spans = sentence_spans(text)
+        self.assertEqual(spans.tolist(), [0, 15, 16, 38])
+        self.assertEqual([text[start:end] for start, end in zip(spans[::2], spans[1::2])], tokenize_sentences(text))
+
+
+    def test_word_spans(self):
+        text = 'I said "help". Did it?'
+        spans = word_spans(text)
+        self.assertEqual([text[start:end] for start, end in zip(spans[::2], spans[1::2])],
+                         ["I", "said", '"', "help", '"', ".", "Did", "it", "?"])
+        self.assertEqual([item.tolist() for item in word_spans(["a b", "a b"])], [[0, 1, 2, 3], [0, 1, 2, 3]])
+
+
+    def test_tokenize_words_regex(self):
+        text = 'I cannot go. He said "hi" to Mr. Smith, didn\'t he? It costs $3,000.50.'
+        self.assertEqual(tokenize_words(text, 'regex'),
+                         ["I", "can", "not", "go", ".", "He", "said", "``", "hi", "''", "to", "Mr.", "Smith", ",",
+                          "did", "n't", "he", "?", "It", "costs", "$", "3,000.50", "."])
+        self.assertEqual(tokenize_words(["a b.", "a b."], 'regex'), [["a", "b", "."], ["a", "b", "."]])
+
+        spans = word_spans(text, 'regex')
+        self.assertEqual([text[start:end] for start, end in zip(spans[::2], spans[1::2])][7:10], ['"', "hi", '"'])
+
+        with self.assertRaises(ValueError):
+            tokenize_words(text, 'invalid_tokenizer')
+
+
+    def test_hash_shingles(self):
+        hashes = hash_shingles("abcab", 2)
+        self.assertEqual(hashes.dtype, np.uint64)
+        self.assertEqual(len(hashes), 4)
+        self.assertEqual(hashes[0], hashes[3])
+        self.assertEqual(len(set(hashes.tolist())), 3)
+
+        result = hash_shingles(["abcab", "x", "", "ab"], 2)
+        self.assertEqual([item.tolist() for item in result], [hashes.tolist(), [], [], [hashes[0]]])
+        self.assertEqual(hash_shingles([], 2), [])
+
+        words = hash_shingles(["the cat  sat on the\tcat", "the cat"], 2, 'word')
+        self.assertEqual(len(words[0]), 5)
+        self.assertEqual(words[0][0], words[0][4])
+        self.assertEqual(words[1].tolist(), [words[0][0]])
+
+        with self.assertRaises(ValueError):
+            hash_shingles("abc", 0)
+        with self.assertRaises(ValueError):
+            hash_shingles("abc", 2, 'invalid_unit')
+
+
+class TestSegmenterRoutes(unittest.TestCase):
+    def setUp(self):
+        app.config['TESTING'] = True
+        self.client = app.test_client()
+
+
+    def test_word_spans_route(self):
+        text = "Hello world. It works."
+        response = self.client.post('/segmenter/words', json={'text': text, 'output': 'spans'})
+        self.assertEqual(response.status_code, 200)
+        spans = response.get_json()['result']
+        self.assertEqual([text[start:end] for start, end in zip(spans[::2], spans[1::2])],
+                         ["Hello", "world", ".", "It", "works", "."])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
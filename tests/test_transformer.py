@@ -41,5 +41,35 @@ class TestTransformerFunctions(unittest.TestCase):
         expected_result_case = "You are a chatbot. You like too help people."
         self.assertEqual(replace_words(text, replacement_dict_case), expected_result_case)
 
+
+    def test_replace_words_dictionary(self):
+        text = "New York and new yorkers met in NEW YORK."
+        replacement_dict = {"New": "Old", "New York": "NYC"}
+        self.assertEqual(replace_words(text, replacement_dict), "NYC and Old yorkers met in NYC.")
+        self.assertEqual(replace_words(text, replacement_dict, True), "NYC and new yorkers met in NEW YORK.")
+
+        self.assertEqual(replace_words("C++ and c", {"c": "C"}), "C++ and C")
+        self.assertEqual(replace_words(["a b", "b a"], {}), ["a b", "b a"])
+
+
+    def test_replace_words_order(self):
+        text = "foo and bar"
+        self.assertEqual(replace_words(text, {"Foo": "x", "foo": "y"}), "x and bar")
+        self.assertEqual(replace_words(text, {"foo": "y", "Foo": "x"}), "x and bar")
+        self.assertEqual(replace_words(text, {"foo": "y", "Foo": "x"}, True), "y and bar")
+
+        replacements = Replacements({"foo": "baz", "bar": "qux"})
+        self.assertEqual(dict(replacements), {"foo": "baz", "bar": "qux"})
+        self.assertEqual(replace_words(text, replacements), "baz and qux")
+        self.assertEqual(replace_words([text, "Bar"], replacements), ["baz and qux", "qux"])
+        self.assertIs(replacements._automaton(False), replacements._automaton(False))
+        self.assertEqual(replace_words(text, Replacements()), text)
+
+    def test_batch_input(self):
+        texts = ["I am a chatbot.", "I have 2 cats.", "I am a chatbot."]
+        self.assertEqual(change_case(texts, 'upper'), ["I AM A CHATBOT.", "I HAVE 2 CATS.", "I AM A CHATBOT."])
+        self.assertEqual(convert_numbers_to_words(texts)[1], "I have two cats.")
+        self.assertEqual(replace_words(texts, {"chatbot": "robot"}), ["I am a robot.", "I have 2 cats.", "I am a robot."])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file